@@ -0,0 +1,77 @@
+from . import models, schemas
+
+# Adult daily reference intakes (DRI: RDA, or AI where no RDA exists),
+# in TACO units, by sex. Sodium is an upper limit rather than a target.
+RDA = {
+    "fiber": {"M": 38.0, "F": 25.0, "unit": "g"},
+    "calcium": {"M": 1000.0, "F": 1000.0, "unit": "mg"},
+    "magnesium": {"M": 420.0, "F": 320.0, "unit": "mg"},
+    "manganese": {"M": 2.3, "F": 1.8, "unit": "mg"},
+    "phosphorus": {"M": 700.0, "F": 700.0, "unit": "mg"},
+    "iron": {"M": 8.0, "F": 18.0, "unit": "mg"},
+    "potassium": {"M": 3400.0, "F": 2600.0, "unit": "mg"},
+    "copper": {"M": 0.9, "F": 0.9, "unit": "mg"},
+    "zinc": {"M": 11.0, "F": 8.0, "unit": "mg"},
+    "rae": {"M": 900.0, "F": 700.0, "unit": "µg"},
+    "thiamin": {"M": 1.2, "F": 1.1, "unit": "mg"},
+    "riboflavin": {"M": 1.3, "F": 1.1, "unit": "mg"},
+    "pyridoxine": {"M": 1.3, "F": 1.3, "unit": "mg"},
+    "niacin": {"M": 16.0, "F": 14.0, "unit": "mg"},
+    "vitamin_c": {"M": 90.0, "F": 75.0, "unit": "mg"},
+}
+
+UPPER_LIMITS = {
+    "sodium": {"M": 2300.0, "F": 2300.0, "unit": "mg"},
+}
+
+# Profile goal attribute for each macro in the daily totals
+GOALS = {
+    "energy_kcal": "goal_get",
+    "protein": "goal_protein_g",
+    "carbohydrate": "goal_carbs_g",
+    "lipid": "goal_fat_g",
+}
+
+def score(profile: models.UserProfile, daily, day) -> schemas.AdherenceReport:
+    """Compare one day's maintained totals against the profile goals and RDAs.
+
+    `daily` is the DailyIntake row for the day, or None when nothing was eaten.
+    """
+    totals = {column: (getattr(daily, column) or 0.0) if daily else 0.0 for column in models.NUTRIENT_COLUMNS}
+    sex = profile.sex if profile.sex in ("M", "F") else "M"
+
+    macros = []
+    for column, goal_attr in GOALS.items():
+        goal = getattr(profile, goal_attr)
+        deviation = (totals[column] - goal) / goal if goal else None
+        macros.append(schemas.MacroAdherence(
+            nutrient=column,
+            intake=round(totals[column], 2),
+            goal=goal,
+            deviation=round(deviation, 4) if deviation is not None else None,
+        ))
+
+    # 100 when every macro is on target, minus the mean absolute deviation
+    deviations = [abs(macro.deviation) for macro in macros if macro.deviation is not None]
+    adherence_score = max(0.0, 100.0 * (1 - sum(deviations) / len(deviations))) if deviations else None
+
+    def status(column, reference):
+        limit = reference[sex]
+        return schemas.MicronutrientStatus(
+            nutrient=column,
+            intake=round(totals[column], 3),
+            reference=limit,
+            unit=reference["unit"],
+            pct=round(100.0 * totals[column] / limit, 1),
+        )
+
+    deficits = [status(column, ref) for column, ref in RDA.items() if totals[column] < ref[sex]]
+    excesses = [status(column, ref) for column, ref in UPPER_LIMITS.items() if totals[column] > ref[sex]]
+
+    return schemas.AdherenceReport(
+        day=day,
+        score=round(adherence_score, 1) if adherence_score is not None else None,
+        macros=macros,
+        deficits=deficits,
+        excesses=excesses,
+    )
@@ -0,0 +1,306 @@
+import functools
+import hashlib
+import inspect
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import parse_obj_as
+from sqlalchemy import event
+
+from . import models
+from .database import SessionLocal
+
+# Set CACHE_URL=redis://host:6379/0 to share the cache between workers;
+# otherwise each process keeps its own in-memory LRU.
+CACHE_URL = os.getenv("CACHE_URL")
+CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", "2048"))
+CACHE_TTL = int(os.getenv("CACHE_TTL", "300"))
+
+_MISSING = object()
+
+class MemoryCache:
+    """In-process LRU with per-entry TTL and tag-based invalidation."""
+
+    def __init__(self, max_entries=CACHE_MAX_ENTRIES, ttl=CACHE_TTL):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict() # key -> (expires_at, value, tags)
+        self._tags = {} # tag -> set of keys
+        self._lock = threading.Lock()
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def generation(self):
+        return self._generation
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return _MISSING
+            if entry[0] < time.monotonic():
+                self._drop(key)
+                self.evictions += 1
+                self.misses += 1
+                return _MISSING
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key, value, tags=(), ttl=None, generation=None):
+        with self._lock:
+            # Something was invalidated while the value was being computed
+            if generation is not None and generation != self._generation:
+                return
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = (time.monotonic() + (ttl or self.ttl), value, tuple(tags))
+            for tag in tags:
+                self._tags.setdefault(tag, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._drop(next(iter(self._entries)))
+                self.evictions += 1
+
+    def invalidate(self, tags):
+        with self._lock:
+            self._generation += 1
+            for tag in tags:
+                for key in self._tags.pop(tag, ()):
+                    if key in self._entries:
+                        self._drop(key)
+                        self.invalidations += 1
+
+    def clear(self):
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+            self._tags.clear()
+
+    def stats(self):
+        return {
+            "backend": "memory",
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
+
+    def _drop(self, key):
+        _, _, tags = self._entries.pop(key)
+        for tag in tags:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+class RedisCache:
+    """Cache on any Redis-protocol client (redis-py, fakeredis, ...).
+
+    Values are stored as JSON; each tag is a set of the keys it covers.
+    """
+
+    def __init__(self, client, ttl=CACHE_TTL, prefix="dietcalc:"):
+        self.client = client
+        self.ttl = ttl
+        self.prefix = prefix
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def generation(self):
+        return int(self.client.get(self.prefix + "generation") or 0)
+
+    def get(self, key):
+        raw = self.client.get(self.prefix + key)
+        if raw is None:
+            self.misses += 1
+            return _MISSING
+        self.hits += 1
+        return json.loads(raw)
+
+    def set(self, key, value, tags=(), ttl=None, generation=None):
+        if generation is not None and generation != self.generation():
+            return
+        ttl = ttl or self.ttl
+        pipe = self.client.pipeline()
+        pipe.set(self.prefix + key, json.dumps(value), ex=ttl)
+        for tag in tags:
+            tag_key = self.prefix + "tag:" + tag
+            pipe.sadd(tag_key, self.prefix + key)
+            pipe.expire(tag_key, ttl)
+        pipe.execute()
+
+    def invalidate(self, tags):
+        self.client.incr(self.prefix + "generation")
+        for tag in tags:
+            tag_key = self.prefix + "tag:" + tag
+            keys = self.client.smembers(tag_key)
+            if keys:
+                self.invalidations += self.client.delete(*keys)
+            self.client.delete(tag_key)
+
+    def clear(self):
+        # Bumped, not deleted: a reset to 0 would let a computation that
+        # started before the clear store its stale result
+        generation_key = self.prefix + "generation"
+        self.client.incr(generation_key)
+        keys = [
+            key for key in self.client.scan_iter(self.prefix + "*")
+            if key not in (generation_key, generation_key.encode())
+        ]
+        if keys:
+            self.client.delete(*keys)
+
+    def stats(self):
+        try:
+            evictions = self.client.info("stats").get("evicted_keys", 0)
+        except Exception:
+            evictions = None
+        return {
+            "backend": "redis",
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": evictions,
+            "invalidations": self.invalidations,
+        }
+
+def create_backend():
+    if CACHE_URL:
+        import redis
+        return RedisCache(redis.Redis.from_url(CACHE_URL))
+    return MemoryCache()
+
+backend = create_backend()
+
+def set_backend(new_backend):
+    global backend
+    backend = new_backend
+
+def make_key(*parts):
+    raw = json.dumps(jsonable_encoder(parts), sort_keys=True)
+    return hashlib.sha1(raw.encode()).hexdigest()
+
+def cached(namespace, key=None, tags=None, model=None, ttl=None):
+    """Cache a router function's serialized result.
+
+    `key(**kwargs)` and `tags(**kwargs)` receive the endpoint arguments;
+    `model` (e.g. List[schemas.Food]) turns ORM results into plain data
+    before storing, since ORM objects can't outlive their session.
+    """
+    def decorator(func):
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            # FastAPI passes keywords; direct callers may pass positionals
+            kwargs = signature.bind(*args, **kwargs).arguments
+            cache_key = namespace + ":" + (make_key(key(**kwargs)) if key else "")
+            value = backend.get(cache_key)
+            if value is not _MISSING:
+                return value
+
+            generation = backend.generation()
+            result = func(**kwargs)
+            value = jsonable_encoder(parse_obj_as(model, result) if model else result)
+            entry_tags = tags(result=value, **kwargs) if tags else ()
+            backend.set(cache_key, value, tags=entry_tags, ttl=ttl, generation=generation)
+            return value
+        return wrapper
+    return decorator
+
+# Single-flight: concurrent identical calls share one computation
+
+class _Flight:
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+_flights = {}
+_flights_lock = threading.Lock()
+coalesced = 0
+
+def single_flight(namespace, key=None, model=None):
+    """Let concurrent calls with the same key wait for the first one's result.
+
+    Nothing is kept once the call finishes; stack under @cached for reuse.
+    Results are serialized (see `cached`) so they can be shared across threads.
+    """
+    def decorator(func):
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            global coalesced
+            kwargs = signature.bind(*args, **kwargs).arguments
+            flight_key = namespace + ":" + (make_key(key(**kwargs)) if key else "")
+
+            with _flights_lock:
+                flight = _flights.get(flight_key)
+                leader = flight is None
+                if leader:
+                    flight = _flights[flight_key] = _Flight()
+                else:
+                    coalesced += 1
+
+            if not leader:
+                flight.done.wait()
+                if flight.error is not None:
+                    raise flight.error
+                return flight.value
+
+            try:
+                result = func(**kwargs)
+                flight.value = jsonable_encoder(parse_obj_as(model, result) if model else result)
+                return flight.value
+            except Exception as e:
+                flight.error = e
+                raise
+            finally:
+                with _flights_lock:
+                    del _flights[flight_key]
+                flight.done.set()
+        return wrapper
+    return decorator
+
+# Invalidation: collect tags for every flushed change, drop them on commit
+
+def tags_for(obj):
+    if isinstance(obj, models.Food):
+        return [f"food:{obj.id}"]
+    if isinstance(obj, models.Category):
+        return ["categories"]
+    if isinstance(obj, models.HouseholdMeasure):
+        return [f"measures:{obj.food_id}"]
+    if isinstance(obj, models.Meal):
+        return [f"meal:{obj.id}"]
+    if isinstance(obj, models.MealItem):
+        return [f"meal:{obj.meal_id}"]
+    return []
+
+@event.listens_for(SessionLocal, "after_flush")
+def _collect_tags(session, flush_context):
+    pending = session.info.setdefault("cache_tags", set())
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        pending.update(tags_for(obj))
+
+@event.listens_for(SessionLocal, "after_commit")
+def _invalidate(session):
+    pending = session.info.pop("cache_tags", None)
+    if pending:
+        backend.invalidate(pending)
+
+@event.listens_for(SessionLocal, "after_soft_rollback")
+def _discard(session, previous_transaction):
+    session.info.pop("cache_tags", None)
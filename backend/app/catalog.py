@@ -0,0 +1,129 @@
+import gzip
+import json
+import threading
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import parse_obj_as
+from sqlalchemy import event, func, insert, text
+from sqlalchemy.orm import Session
+from typing import List
+
+from . import models, schemas
+from .database import SessionLocal
+
+# Change log for offline clients: every flushed insert/update/delete of a
+# food, category or household measure appends a row to catalog_changes in
+# the same transaction.
+
+ENTITIES = {
+    models.Food: "food",
+    models.Category: "category",
+    models.HouseholdMeasure: "measure",
+}
+
+# Postgres can commit concurrent transactions out of order, so a client could
+# read version N and never see a change numbered below N that committed
+# later. Writers to the log hold this transaction-level advisory lock until
+# they commit, which hands out versions in commit order. (SQLite already
+# has a single writer.)
+LOG_LOCK_KEY = 7_203_401
+
+def _lock_log(connection):
+    if connection.dialect.name == "postgresql":
+        connection.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": LOG_LOCK_KEY})
+
+@event.listens_for(SessionLocal, "after_flush")
+def _record_changes(session, flush_context):
+    rows = []
+    for objects, op in ((session.new, "upsert"), (session.dirty, "upsert"), (session.deleted, "delete")):
+        for obj in objects:
+            entity = ENTITIES.get(type(obj))
+            if entity is None:
+                continue
+            if op == "upsert" and obj in session.dirty and not session.is_modified(obj):
+                continue
+            rows.append({"entity": entity, "entity_id": obj.id, "op": op})
+    if rows:
+        _lock_log(session.connection())
+        session.connection().execute(insert(models.CatalogChange), rows)
+
+def record_reset(db: Session):
+    """Mark the whole catalog as replaced (e.g. after a TACO re-import)."""
+    _lock_log(db.connection())
+    db.add(models.CatalogChange(entity="catalog", op="reset"))
+    db.commit()
+
+def current_version(db: Session) -> int:
+    return db.query(func.coalesce(func.max(models.CatalogChange.version), 0)).scalar()
+
+def _rows(db: Session, food_ids=None, category_ids=None, measure_ids=None):
+    foods = db.query(models.Food)
+    categories = db.query(models.Category)
+    measures = db.query(models.HouseholdMeasure)
+    if food_ids is not None:
+        foods = foods.filter(models.Food.id.in_(food_ids))
+        categories = categories.filter(models.Category.id.in_(category_ids))
+        measures = measures.filter(models.HouseholdMeasure.id.in_(measure_ids))
+    return {
+        "foods": parse_obj_as(List[schemas.FoodDetail], foods.order_by(models.Food.id).all()),
+        "categories": parse_obj_as(List[schemas.CategorySimple], categories.order_by(models.Category.id).all()),
+        "measures": parse_obj_as(List[schemas.HouseholdMeasure], measures.order_by(models.HouseholdMeasure.id).all()),
+    }
+
+_snapshot = (None, None)
+_snapshot_lock = threading.Lock()
+
+def snapshot(db: Session):
+    """Return (version, gzipped JSON) of the full catalog, built once per version."""
+    global _snapshot
+    # Version first: a change committed while the rows are read is both in
+    # the snapshot and in the log after `version`, and replaying it is harmless
+    version = current_version(db)
+    with _snapshot_lock:
+        if _snapshot[0] == version:
+            return _snapshot
+        body = {"version": version, **_rows(db)}
+        data = gzip.compress(json.dumps(jsonable_encoder(body), separators=(",", ":")).encode(), compresslevel=6)
+        _snapshot = (version, data)
+        return _snapshot
+
+def changes_since(db: Session, since: int) -> schemas.CatalogChanges:
+    version = current_version(db)
+    if since > version:
+        return schemas.CatalogChanges(version=version, reset=True)
+
+    # Last operation per entity row after `since`
+    latest = (
+        db.query(
+            models.CatalogChange.entity,
+            models.CatalogChange.entity_id,
+            models.CatalogChange.op,
+        )
+        .filter(models.CatalogChange.version > since)
+        .filter(
+            models.CatalogChange.version.in_(
+                db.query(func.max(models.CatalogChange.version))
+                .filter(models.CatalogChange.version > since)
+                .group_by(models.CatalogChange.entity, models.CatalogChange.entity_id)
+            )
+        )
+        .all()
+    )
+
+    if any(op == "reset" for _, _, op in latest):
+        return schemas.CatalogChanges(version=version, reset=True)
+
+    upserts = {"food": [], "category": [], "measure": []}
+    deleted = {"foods": [], "categories": [], "measures": []}
+    plural = {"food": "foods", "category": "categories", "measure": "measures"}
+    for entity, entity_id, op in latest:
+        if op == "delete":
+            deleted[plural[entity]].append(entity_id)
+        else:
+            upserts[entity].append(entity_id)
+
+    return schemas.CatalogChanges(
+        version=version,
+        deleted=deleted,
+        **_rows(db, upserts["food"], upserts["category"], upserts["measure"]),
+    )
@@ -0,0 +1,193 @@
+import contextvars
+import os
+import zlib
+
+from fastapi.responses import JSONResponse
+from starlette.datastructures import Headers, MutableHeaders
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+# Bodies smaller than this are sent as is
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+
+MSGPACK_TYPES = ("application/msgpack", "application/x-msgpack")
+EXCLUDED_CONTENT_TYPES = ("text/event-stream",)
+
+def _accepted(header, supported):
+    """Pick the supported value with the highest q in an Accept-* header."""
+    best, best_q = None, 0.0
+    for part in header.split(","):
+        value, _, params = part.strip().partition(";")
+        value = value.strip().lower()
+        q = 1.0
+        for param in params.split(";"):
+            name, _, number = param.strip().partition("=")
+            if name == "q":
+                try:
+                    q = float(number)
+                except ValueError:
+                    q = 0.0
+        if value in supported and q > best_q:
+            best, best_q = value, q
+    return best
+
+# MessagePack responses
+
+_wants_msgpack = contextvars.ContextVar("wants_msgpack", default=False)
+
+class NegotiatedResponse(JSONResponse):
+    """JSON by default; MessagePack when the request's Accept asks for it."""
+
+    def render(self, content):
+        if _wants_msgpack.get():
+            self.media_type = "application/msgpack"
+            return msgpack.packb(content, use_bin_type=True)
+        return super().render(content)
+
+class ContentNegotiationMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or msgpack is None:
+            await self.app(scope, receive, send)
+            return
+
+        accept = Headers(scope=scope).get("accept", "")
+        wants_msgpack = _accepted(accept, MSGPACK_TYPES + ("application/json", "*/*")) in MSGPACK_TYPES
+        token = _wants_msgpack.set(wants_msgpack)
+
+        async def send_with_vary(message):
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message).add_vary_header("Accept")
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_vary)
+        finally:
+            _wants_msgpack.reset(token)
+
+# Compression
+
+class _Gzip:
+    name = "gzip"
+
+    def __init__(self):
+        self._compressor = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data, final):
+        out = self._compressor.compress(data)
+        if final:
+            out += self._compressor.flush()
+        elif data:
+            # Push each streamed chunk to the client right away
+            out += self._compressor.flush(zlib.Z_SYNC_FLUSH)
+        return out
+
+class _Brotli:
+    name = "br"
+
+    def __init__(self):
+        self._compressor = brotli.Compressor(quality=5)
+
+    def compress(self, data, final):
+        out = self._compressor.process(data)
+        if final:
+            out += self._compressor.finish()
+        elif data:
+            out += self._compressor.flush()
+        return out
+
+class CompressionMiddleware:
+    """gzip / brotli negotiated from Accept-Encoding, for bodies over a threshold.
+
+    Streaming responses are compressed chunk by chunk. Responses that
+    already carry a Content-Encoding (e.g. the catalog snapshot) are left alone.
+    """
+
+    def __init__(self, app, minimum_size=COMPRESSION_MIN_SIZE):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.encodings = {"gzip": _Gzip}
+        if brotli is not None:
+            self.encodings["br"] = _Brotli
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        accept = Headers(scope=scope).get("accept-encoding", "")
+        encoding = _accepted(accept, tuple(self.encodings))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start = None
+        compressor = None
+        passthrough = False
+
+        async def send_compressed(message):
+            nonlocal start, compressor, passthrough
+
+            if message["type"] == "http.response.start":
+                start = message
+                headers = Headers(raw=message["headers"])
+                passthrough = (
+                    "content-encoding" in headers
+                    or headers.get("content-type", "").startswith(EXCLUDED_CONTENT_TYPES)
+                )
+                return
+
+            if message["type"] != "http.response.body":
+                if start is not None:
+                    await send(start)
+                    start = None
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+
+            if start is not None:
+                headers = MutableHeaders(scope=start)
+                if passthrough or (not more_body and len(body) < self.minimum_size):
+                    if not passthrough:
+                        headers.add_vary_header("Accept-Encoding")
+                    await send(start)
+                    start = None
+                    passthrough = True
+                    await send(message)
+                    return
+
+                compressor = self.encodings[encoding]()
+                headers.add_vary_header("Accept-Encoding")
+                headers["Content-Encoding"] = encoding
+                del headers["Content-Length"]
+                body = compressor.compress(body, final=not more_body)
+                if not more_body:
+                    headers["Content-Length"] = str(len(body))
+                await send(start)
+                start = None
+                await send({"type": "http.response.body", "body": body, "more_body": more_body})
+                return
+
+            if passthrough:
+                await send(message)
+                return
+
+            await send({
+                "type": "http.response.body",
+                "body": compressor.compress(body, final=not more_body),
+                "more_body": more_body,
+            })
+
+        await self.app(scope, receive, send_compressed)
@@ -1,7 +1,9 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+import itertools
 import os
+import threading
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -27,6 +29,69 @@ else:
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# SQLite concurrency: WAL lets readers run alongside the writer, and writers
+# wait (busy_timeout) instead of failing with "database is locked"
+SQLITE_BUSY_TIMEOUT = int(os.getenv("SQLITE_BUSY_TIMEOUT", "5000"))
+
+class WriterQueue:
+    """Hands the SQLite write lock to one session at a time, first come first served.
+
+    Reentrant per thread, so a session opened while another one in the same
+    thread holds the lock doesn't deadlock on it.
+    """
+
+    def __init__(self):
+        self._condition = threading.Condition()
+        self._tickets = itertools.count()
+        self._serving = 0
+        self._owner = None
+        self._depth = 0
+
+    def acquire(self):
+        me = threading.get_ident()
+        with self._condition:
+            if self._owner == me:
+                self._depth += 1
+                return
+            ticket = next(self._tickets)
+            while ticket != self._serving:
+                self._condition.wait()
+            self._owner = me
+            self._depth = 1
+
+    def release(self):
+        with self._condition:
+            self._depth -= 1
+            if self._depth == 0:
+                self._owner = None
+                self._serving += 1
+                self._condition.notify_all()
+
+writer = WriterQueue()
+
+if engine.dialect.name == "sqlite":
+    @event.listens_for(engine, "connect")
+    def _sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute(f"PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT}")
+        # Safe with WAL: a power loss can drop the last commits, not corrupt the file
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.close()
+
+    # A session takes its turn at its first flush (pysqlite only opens the
+    # write transaction there) and gives it up when the transaction ends
+    @event.listens_for(SessionLocal, "before_flush")
+    def _queue_writer(session, flush_context, instances):
+        if not session.info.get("writer"):
+            writer.acquire()
+            session.info["writer"] = True
+
+    @event.listens_for(SessionLocal, "after_transaction_end")
+    def _release_writer(session, transaction):
+        if transaction.parent is None and session.info.pop("writer", False):
+            writer.release()
+
 Base = declarative_base()
 
 def get_db():
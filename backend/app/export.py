@@ -0,0 +1,147 @@
+import csv
+import io
+import json
+from datetime import date, datetime
+
+from fastapi import HTTPException
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Integer, Float, DateTime, Date
+
+from . import database
+from .schemas import ExportFormatEnum
+
+# Rows fetched per round trip from the server-side cursor; each chunk is
+# serialized and flushed before the next one is fetched.
+CHUNK_SIZE = 1000
+
+MEDIA_TYPES = {
+    ExportFormatEnum.CSV: "text/csv",
+    ExportFormatEnum.NDJSON: "application/x-ndjson",
+    ExportFormatEnum.PARQUET: "application/vnd.apache.parquet",
+    ExportFormatEnum.ARROW: "application/vnd.apache.arrow.stream",
+}
+
+def _json_default(value):
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+def _iter_chunks(statement):
+    # Own session: the request-scoped one from get_db may already be closed
+    # by the time the response body is consumed.
+    db = database.SessionLocal()
+    try:
+        result = db.execute(
+            statement.execution_options(stream_results=True, yield_per=CHUNK_SIZE)
+        )
+        for rows in result.partitions():
+            yield rows
+    finally:
+        db.close()
+
+def _csv_stream(statement, columns):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    for rows in _iter_chunks(statement):
+        writer.writerows(rows)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate(0)
+    # Header only, for an empty result
+    if buffer.tell():
+        yield buffer.getvalue()
+
+def _ndjson_stream(statement, columns):
+    for rows in _iter_chunks(statement):
+        yield "".join(
+            json.dumps(dict(zip(columns, row)), default=_json_default, ensure_ascii=False) + "\n"
+            for row in rows
+        )
+
+class _ChunkSink:
+    # Minimal writable file object for pyarrow: collects written bytes so
+    # they can be drained and yielded after every batch.
+    closed = False
+
+    def __init__(self):
+        self._parts = []
+        self._position = 0
+
+    def write(self, data):
+        self._parts.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._position
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def drain(self):
+        data = b"".join(self._parts)
+        self._parts = []
+        return data
+
+def _arrow_schema(pa, statement):
+    fields = []
+    for column in statement.selected_columns:
+        if isinstance(column.type, Integer):
+            arrow_type = pa.int64()
+        elif isinstance(column.type, Float):
+            arrow_type = pa.float64()
+        elif isinstance(column.type, DateTime):
+            arrow_type = pa.timestamp("us")
+        elif isinstance(column.type, Date):
+            arrow_type = pa.date32()
+        else:
+            arrow_type = pa.string()
+        fields.append(pa.field(column.key, arrow_type))
+    return pa.schema(fields)
+
+def _arrow_stream(statement, parquet):
+    import pyarrow as pa
+
+    schema = _arrow_schema(pa, statement)
+    sink = _ChunkSink()
+    if parquet:
+        import pyarrow.parquet as pq
+        writer = pq.ParquetWriter(sink, schema)
+    else:
+        writer = pa.ipc.new_stream(sink, schema)
+
+    for rows in _iter_chunks(statement):
+        batch = pa.RecordBatch.from_arrays(
+            [pa.array(values, type=field.type) for values, field in zip(zip(*rows), schema)],
+            schema=schema,
+        )
+        writer.write_batch(batch)
+        yield sink.drain()
+
+    writer.close()
+    yield sink.drain()
+
+def stream_export(statement, export_format: ExportFormatEnum, filename: str):
+    """Stream the rows of a Core select as csv, ndjson, parquet or arrow."""
+    columns = [column.key for column in statement.selected_columns]
+
+    if export_format in (ExportFormatEnum.PARQUET, ExportFormatEnum.ARROW):
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            raise HTTPException(status_code=501, detail=f"Format '{export_format.value}' requires pyarrow")
+        body = _arrow_stream(statement, parquet=export_format == ExportFormatEnum.PARQUET)
+    elif export_format == ExportFormatEnum.CSV:
+        body = _csv_stream(statement, columns)
+    else:
+        body = _ndjson_stream(statement, columns)
+
+    return StreamingResponse(
+        body,
+        media_type=MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}.{export_format.value}"'},
+    )
@@ -0,0 +1,57 @@
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+from . import models, schemas
+from .database import SessionLocal
+from .routers.nutrition import calculate_nutrition
+
+# Profile goals are derived on the server: whenever one of INPUTS changes,
+# the goals are recomputed through the nutrition calculator, stored on the
+# profile and goals_version is bumped. Readers (e.g. the adherence report)
+# use the stored goals; clients can compare goals_version to tell whether
+# anything they derived from the goals is stale.
+
+INPUTS = ("age", "weight", "height", "sex", "activity_level")
+
+def derive(profile: models.UserProfile) -> dict:
+    result = calculate_nutrition(schemas.NutritionCalculationRequest(
+        age=profile.age,
+        weight=profile.weight,
+        height=profile.height,
+        sex=profile.sex,
+        activity_level=profile.activity_level,
+    ))
+    # Upper end of each macro range, as the calculator page used to save
+    return {
+        "goal_tmb": result["tmb"],
+        "goal_get": result["get"],
+        "goal_protein_g": result["macros"]["protein"]["max_grams"],
+        "goal_carbs_g": result["macros"]["carbohydrate"]["max_grams"],
+        "goal_fat_g": result["macros"]["lipid"]["max_grams"],
+    }
+
+def _update(profile):
+    if any(getattr(profile, name) is None for name in INPUTS):
+        return
+    for column, value in derive(profile).items():
+        setattr(profile, column, value)
+    profile.goals_version = (profile.goals_version or 0) + 1
+
+@event.listens_for(SessionLocal, "before_flush")
+def _derive_goals(session, flush_context, instances):
+    for obj in list(session.new) + list(session.dirty):
+        if not isinstance(obj, models.UserProfile):
+            continue
+        if obj in session.dirty:
+            state = inspect(obj)
+            if not any(state.attrs[name].history.has_changes() for name in INPUTS):
+                continue
+        _update(obj)
+
+def backfill(db: Session):
+    """Derive goals for profiles saved with client-computed ones (one-time migration)."""
+    for profile in db.query(models.UserProfile).filter(models.UserProfile.goals_version.is_(None)):
+        _update(profile)
+        if profile.goals_version is None:
+            profile.goals_version = 0
+    db.commit()
@@ -0,0 +1,202 @@
+import hashlib
+import json
+import os
+import time
+import zlib
+from datetime import datetime, timedelta
+
+from sqlalchemy.exc import IntegrityError
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers
+from starlette.responses import JSONResponse
+
+from . import models
+from .database import SessionLocal
+
+# How long a stored response can be replayed
+IDEMPOTENCY_TTL = int(os.getenv("IDEMPOTENCY_TTL", str(24 * 3600)))
+
+# A claim whose request hasn't finished within this many seconds (the
+# process died mid-request) can be taken over by a retry
+IDEMPOTENCY_LEASE = int(os.getenv("IDEMPOTENCY_LEASE", "60"))
+
+# Expired keys are purged at most this often (seconds)
+PURGE_INTERVAL = 300
+
+# Larger responses are not stored (the request still runs normally)
+MAX_STORED_BODY = 1024 * 1024
+
+METHODS = ("POST", "PUT", "PATCH")
+
+def _digest(*parts):
+    return hashlib.sha256("\n".join(parts).encode("utf-8", "surrogateescape")).hexdigest()
+
+def _claim(key, fingerprint):
+    """Reserve `key` for this request, or return the existing entry."""
+    db = SessionLocal()
+    try:
+        now = datetime.utcnow()
+        entry = db.get(models.IdempotencyKey, key)
+        if entry is not None and entry.expires_at < now:
+            db.delete(entry)
+            db.flush()
+            entry = None
+        if entry is not None:
+            db.expunge(entry)
+            return entry
+
+        # In progress: expires after the lease, then _store extends it
+        db.add(models.IdempotencyKey(
+            key=key,
+            fingerprint=fingerprint,
+            expires_at=now + timedelta(seconds=IDEMPOTENCY_LEASE),
+        ))
+        try:
+            db.commit()
+        except IntegrityError:
+            # A concurrent retry claimed it first
+            db.rollback()
+            entry = db.get(models.IdempotencyKey, key)
+            if entry is not None:
+                db.expunge(entry)
+            return entry
+        return None
+    finally:
+        db.close()
+
+def _store(key, status_code, headers, body):
+    db = SessionLocal()
+    try:
+        entry = db.get(models.IdempotencyKey, key)
+        if entry is None:
+            return
+        if status_code >= 500:
+            # Let the client retry for real
+            db.delete(entry)
+        else:
+            entry.status_code = status_code
+            entry.headers = json.dumps(headers)
+            entry.body = zlib.compress(body)
+            entry.expires_at = datetime.utcnow() + timedelta(seconds=IDEMPOTENCY_TTL)
+        db.commit()
+    finally:
+        db.close()
+
+def _release(key):
+    db = SessionLocal()
+    try:
+        db.query(models.IdempotencyKey).filter(models.IdempotencyKey.key == key).delete()
+        db.commit()
+    finally:
+        db.close()
+
+def _purge_expired():
+    db = SessionLocal()
+    try:
+        db.query(models.IdempotencyKey).filter(
+            models.IdempotencyKey.expires_at < datetime.utcnow()
+        ).delete(synchronize_session=False)
+        db.commit()
+    finally:
+        db.close()
+
+class IdempotencyMiddleware:
+    """Replay the stored response for a repeated Idempotency-Key on writes.
+
+    The first request with a key runs normally and its response is stored
+    for IDEMPOTENCY_TTL seconds. Retries with the same key and body get that
+    response back without running the route again; a retry while the first
+    one is still running gets 409 (for up to IDEMPOTENCY_LEASE seconds, after
+    which the retry takes the key over), and reusing the key with a different
+    body or Accept header gets 422.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self._last_purge = 0.0
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] not in METHODS:
+            await self.app(scope, receive, send)
+            return
+
+        request_headers = Headers(scope=scope)
+        client_key = request_headers.get("idempotency-key")
+        if not client_key:
+            await self.app(scope, receive, send)
+            return
+
+        # Read the whole body to fingerprint it, then hand it on unchanged
+        chunks = []
+        more_body = True
+        while more_body:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                return
+            chunks.append(message.get("body", b""))
+            more_body = message.get("more_body", False)
+        body = b"".join(chunks)
+
+        key = _digest(scope["method"], scope["path"], client_key)
+        # The stored response is in the representation first negotiated
+        # (JSON or MessagePack), so a retry must ask for the same one
+        fingerprint = hashlib.sha256(request_headers.get("accept", "").encode("latin-1") + b"\n" + body).hexdigest()
+
+        if time.monotonic() - self._last_purge > PURGE_INTERVAL:
+            self._last_purge = time.monotonic()
+            await run_in_threadpool(_purge_expired)
+
+        entry = await run_in_threadpool(_claim, key, fingerprint)
+        if entry is not None:
+            if entry.fingerprint != fingerprint:
+                response = JSONResponse({"detail": "Idempotency-Key reused with a different request body or Accept header"}, status_code=422)
+            elif entry.status_code is None:
+                response = JSONResponse({"detail": "A request with this Idempotency-Key is still in progress"}, status_code=409)
+            else:
+                await send({
+                    "type": "http.response.start",
+                    "status": entry.status_code,
+                    "headers": [(name.encode("latin-1"), value.encode("latin-1")) for name, value in json.loads(entry.headers)]
+                    + [(b"idempotent-replayed", b"true")],
+                })
+                await send({"type": "http.response.body", "body": zlib.decompress(entry.body)})
+                return
+            await response(scope, receive, send)
+            return
+
+        delivered = False
+
+        async def replay_receive():
+            nonlocal delivered
+            if not delivered:
+                delivered = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            return await receive()
+
+        status_code = 500
+        headers = []
+        response_chunks = []
+        response_size = 0
+
+        async def capture_send(message):
+            nonlocal status_code, headers, response_size
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                headers = [(name.decode("latin-1"), value.decode("latin-1")) for name, value in message.get("headers", [])]
+            elif message["type"] == "http.response.body":
+                chunk = message.get("body", b"")
+                response_size += len(chunk)
+                # Past the limit it won't be stored; stop buffering
+                if response_size <= MAX_STORED_BODY:
+                    response_chunks.append(chunk)
+            await send(message)
+
+        try:
+            await self.app(scope, replay_receive, capture_send)
+        except BaseException:
+            await run_in_threadpool(_release, key)
+            raise
+        if response_size > MAX_STORED_BODY:
+            await run_in_threadpool(_release, key)
+        else:
+            await run_in_threadpool(_store, key, status_code, headers, b"".join(response_chunks))
@@ -0,0 +1,212 @@
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import Date, cast, event, func, insert, inspect, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from . import models
+from .database import SessionLocal
+
+# Meal item snapshots: new items get the food's nutrients scaled to their
+# quantity before they are flushed, and keep them if the food changes later.
+
+def _scaled(food, quantity):
+    values = {}
+    for column in models.NUTRIENT_COLUMNS:
+        value = getattr(food, column) if food is not None else None
+        values[column] = value * quantity / food.base_qty if value is not None and food.base_qty else None
+    return values
+
+@event.listens_for(SessionLocal, "before_flush")
+def _snapshot_items(session, flush_context, instances):
+    pending = []
+    for obj in list(session.new) + list(session.dirty):
+        if not isinstance(obj, models.MealItem):
+            continue
+        state = inspect(obj)
+        if obj in session.new or state.attrs.food_id.history.has_changes():
+            pending.append(obj)
+            continue
+        old_quantity = state.attrs.quantity.history.deleted
+        if old_quantity and old_quantity[0]:
+            # Same food, new quantity: rescale what was snapshotted
+            ratio = obj.quantity / old_quantity[0]
+            for column in models.NUTRIENT_COLUMNS:
+                value = getattr(obj, column)
+                setattr(obj, column, value * ratio if value is not None else None)
+
+    if not pending:
+        return
+    with session.no_autoflush:
+        foods = {
+            food.id: food for food in
+            session.query(models.Food).filter(models.Food.id.in_({obj.food_id for obj in pending}))
+        }
+    for obj in pending:
+        for column, value in _scaled(foods.get(obj.food_id), obj.quantity).items():
+            setattr(obj, column, value)
+
+def snapshot_existing(connection):
+    """Fill the snapshot columns of items that predate them (one-time migration)."""
+    item = models.MealItem
+    food = models.Food
+    connection.execute(
+        update(item).values({
+            column: select(item.quantity * getattr(food, column) / food.base_qty)
+            .where(food.id == item.food_id)
+            .scalar_subquery()
+            for column in models.NUTRIENT_COLUMNS
+        })
+    )
+
+# Intake log maintenance: every flushed meal item insert/delete (and
+# quantity change) appends rows to intake_log in the same transaction.
+
+def _append_item(connection, item, meal):
+    consumed_at = item.consumed_at or (meal.consumed_at if meal else None) or datetime.utcnow()
+    user_id = meal.user_id if meal and meal.user_id is not None else models.DEFAULT_USER_ID
+    connection.execute(
+        insert(models.IntakeLog).values(
+            user_id=user_id,
+            consumed_at=consumed_at,
+            meal_id=item.meal_id,
+            meal_item_id=item.id,
+            food_id=item.food_id,
+            quantity=item.quantity,
+            **{column: getattr(item, column) for column in models.NUTRIENT_COLUMNS},
+        )
+    )
+
+def _reverse_item(connection, item_id):
+    # Negate whatever is currently logged for the item, so the reversal
+    # matches the original values even if the food was edited since
+    log = models.IntakeLog
+    source = (
+        select(
+            log.user_id,
+            log.consumed_at,
+            log.meal_id,
+            log.meal_item_id,
+            log.food_id,
+            -func.sum(log.quantity),
+            *[-func.sum(getattr(log, column)) for column in models.NUTRIENT_COLUMNS],
+        )
+        .where(log.meal_item_id == item_id)
+        .group_by(log.user_id, log.consumed_at, log.meal_id, log.meal_item_id, log.food_id)
+        .having(func.sum(log.quantity) != 0)
+    )
+    connection.execute(
+        insert(log).from_select(
+            ["user_id", "consumed_at", "meal_id", "meal_item_id", "food_id", "quantity", *models.NUTRIENT_COLUMNS],
+            source,
+        )
+    )
+
+def _insert_ignore(dialect_name, table):
+    if dialect_name == "postgresql":
+        return postgresql.insert(table).on_conflict_do_nothing(index_elements=["user_id", "day"])
+    return sqlite.insert(table).on_conflict_do_nothing(index_elements=["user_id", "day"])
+
+def refresh_daily(connection, item_ids=None):
+    """Recompute daily_intake rows for the days touched by `item_ids` (all if None)."""
+    log = models.IntakeLog
+    daily = models.DailyIntake
+    day = bucket_expression(connection.dialect.name, "day", log.consumed_at)
+
+    touched = select(log.user_id, day.label("day")).distinct()
+    if item_ids is not None:
+        touched = touched.where(log.meal_item_id.in_(item_ids))
+    days = connection.execute(touched).all()
+
+    for user_id, current_day in days:
+        if isinstance(current_day, str):
+            current_day = date.fromisoformat(current_day)
+        # Make sure the row exists, then lock it before summing: a concurrent
+        # transaction on the same day waits here until the other commits, and
+        # (read committed) the sum below then includes its log rows
+        connection.execute(_insert_ignore(connection.dialect.name, daily).values(user_id=user_id, day=current_day))
+        connection.execute(
+            select(daily.id).where(daily.user_id == user_id, daily.day == current_day).with_for_update()
+        )
+        start = datetime.combine(current_day, datetime.min.time())
+        sums = connection.execute(
+            select(
+                func.sum(log.quantity),
+                *[func.sum(getattr(log, column)) for column in models.NUTRIENT_COLUMNS],
+            )
+            .where(log.user_id == user_id)
+            .where(log.consumed_at >= start, log.consumed_at < start + timedelta(days=1))
+        ).one()
+        connection.execute(
+            update(daily)
+            .where(daily.user_id == user_id, daily.day == current_day)
+            .values(dict(zip(["quantity", *models.NUTRIENT_COLUMNS], sums)))
+        )
+
+@event.listens_for(SessionLocal, "after_flush")
+def _record_intake(session, flush_context):
+    touched = []
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        if not isinstance(obj, models.MealItem):
+            continue
+        if obj in session.dirty and not session.is_modified(obj):
+            continue
+        connection = session.connection()
+        meal = session.get(models.Meal, obj.meal_id) if obj.meal_id else None
+        if obj in session.deleted or obj in session.dirty:
+            _reverse_item(connection, obj.id)
+        if obj not in session.deleted:
+            _append_item(connection, obj, meal)
+        touched.append(obj.id)
+
+    if touched:
+        refresh_daily(session.connection(), touched)
+
+def backfill(db: Session):
+    """Log meal items that predate the intake log (one-time migration)."""
+    now = datetime.utcnow()
+    db.query(models.Meal).filter(models.Meal.user_id.is_(None)).update(
+        {models.Meal.user_id: models.DEFAULT_USER_ID}, synchronize_session=False
+    )
+    db.query(models.Meal).filter(models.Meal.consumed_at.is_(None)).update(
+        {models.Meal.consumed_at: now}, synchronize_session=False
+    )
+    db.query(models.MealItem).filter(models.MealItem.consumed_at.is_(None)).update(
+        {models.MealItem.consumed_at: now}, synchronize_session=False
+    )
+    logged = select(models.IntakeLog.meal_item_id)
+    items = db.query(models.MealItem).filter(models.MealItem.id.not_in(logged)).all()
+    connection = db.connection()
+    for item in items:
+        _append_item(connection, item, item.meal)
+    db.commit()
+
+def bucket_expression(dialect_name, bucket, column):
+    """Start of the day/week (Monday)/month containing `column`."""
+    if dialect_name == "postgresql":
+        return cast(func.date_trunc(bucket, column), Date)
+    if bucket == "day":
+        return func.date(column)
+    if bucket == "week":
+        # Next Sunday (or today, if Sunday), then back to Monday
+        return func.date(column, "weekday 0", "-6 days")
+    return func.date(column, "start of month")
+
+def summary(db: Session, user_id, start, end, bucket):
+    log = models.IntakeLog
+    period = bucket_expression(db.get_bind().dialect.name, bucket, log.consumed_at).label("period")
+    query = (
+        db.query(
+            period,
+            func.sum(log.quantity),
+            *[func.sum(getattr(log, column)) for column in models.NUTRIENT_COLUMNS],
+        )
+        .filter(log.user_id == user_id)
+        .group_by(period)
+        .order_by(period)
+    )
+    if start:
+        query = query.filter(log.consumed_at >= start)
+    if end:
+        query = query.filter(log.consumed_at < end)
+    return query.all()
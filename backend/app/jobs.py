@@ -0,0 +1,229 @@
+import json
+import multiprocessing
+import os
+import socket
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+from fastapi.encoders import jsonable_encoder
+
+from . import cache, models, schemas
+from .database import SessionLocal
+
+# Worker processes for background jobs; defaults to one per core
+JOB_WORKERS = int(os.getenv("JOB_WORKERS") or os.cpu_count() or 1)
+
+# Minimum interval between progress writes to the jobs table
+PROGRESS_INTERVAL = 0.5
+
+class JobCancelled(BaseException):
+    # BaseException so the broad `except Exception` blocks in the
+    # standalone scripts don't swallow a cancellation
+    pass
+
+class JobContext:
+    """Handed to task functions; reports progress and checks for cancellation."""
+
+    def __init__(self, job_id: int):
+        self.job_id = job_id
+        self._last_write = 0.0
+
+    def progress(self, done, total=None):
+        now = time.monotonic()
+        if now - self._last_write < PROGRESS_INTERVAL:
+            return
+        self._last_write = now
+
+        db = SessionLocal()
+        try:
+            job = db.get(models.Job, self.job_id)
+            if job.cancel_requested:
+                raise JobCancelled()
+            # progress is a 0.0 - 1.0 fraction; without a total only the
+            # cancellation check applies
+            if total:
+                job.progress = min(done / total, 1.0)
+            db.commit()
+        finally:
+            db.close()
+
+# Task functions run inside worker processes. The import tooling (and
+# openpyxl for .xlsx) is imported here so the API process never loads it.
+
+def _import_taco(ctx, params):
+    from backend import import_taco
+
+    # Always the configured TACO_FILE: a client-supplied path would let any
+    # caller point the server at arbitrary files
+    file_path = import_taco.DEFAULT_FILE_PATH
+    if not os.path.exists(file_path):
+        raise FileNotFoundError(file_path)
+    return import_taco.import_data(file_path, progress=ctx.progress)
+
+def _seed_measures(ctx, params):
+    from backend import seed_measures
+
+    return seed_measures.seed_measures(progress=ctx.progress)
+
+def _migrate_to_postgres(ctx, params):
+    from backend import migrate_to_postgres
+
+    return migrate_to_postgres.migrate(progress=ctx.progress)
+
+def _nutrition_batch(ctx, params):
+    from .routers.nutrition import calculate_nutrition
+
+    inputs = params.get("inputs", [])
+    results = []
+    for index, data in enumerate(inputs):
+        ctx.progress(index, len(inputs))
+        request = schemas.NutritionCalculationRequest(**data)
+        results.append(jsonable_encoder(calculate_nutrition(request)))
+    return results
+
+TASKS = {
+    schemas.JobKindEnum.IMPORT_TACO: _import_taco,
+    schemas.JobKindEnum.SEED_MEASURES: _seed_measures,
+    schemas.JobKindEnum.MIGRATE_TO_POSTGRES: _migrate_to_postgres,
+    schemas.JobKindEnum.NUTRITION_BATCH: _nutrition_batch,
+}
+
+# Kinds that write to the catalog tables
+CLEARS_CACHE = {schemas.JobKindEnum.IMPORT_TACO, schemas.JobKindEnum.SEED_MEASURES}
+
+def _finish(job_id, status, **fields):
+    db = SessionLocal()
+    try:
+        job = db.get(models.Job, job_id)
+        job.status = status
+        job.finished_at = datetime.utcnow()
+        for key, value in fields.items():
+            setattr(job, key, value)
+        db.commit()
+    finally:
+        db.close()
+
+def run_job(job_id: int):
+    # Entry point inside the worker process
+    db = SessionLocal()
+    try:
+        job = db.get(models.Job, job_id)
+        if job is None or job.status != schemas.JobStatusEnum.PENDING.value:
+            return
+        if job.cancel_requested:
+            job.status = schemas.JobStatusEnum.CANCELLED.value
+            job.finished_at = datetime.utcnow()
+            db.commit()
+            return
+        job.status = schemas.JobStatusEnum.RUNNING.value
+        job.started_at = datetime.utcnow()
+        db.commit()
+        kind = schemas.JobKindEnum(job.kind)
+        params = json.loads(job.params) if job.params else {}
+    finally:
+        db.close()
+
+    try:
+        result = TASKS[kind](JobContext(job_id), params)
+    except JobCancelled:
+        _finish(job_id, schemas.JobStatusEnum.CANCELLED.value)
+    except Exception as e:
+        _finish(job_id, schemas.JobStatusEnum.FAILED.value, error=f"{type(e).__name__}: {e}")
+    else:
+        _finish(job_id, schemas.JobStatusEnum.SUCCEEDED.value, progress=1.0, result=json.dumps(result))
+
+_executor = None
+_executor_lock = threading.Lock()
+_futures = {}
+
+def get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            # spawn: forking a threaded server process is unsafe
+            _executor = ProcessPoolExecutor(
+                max_workers=JOB_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _executor
+
+def _done(job_id, kind, future):
+    _futures.pop(job_id, None)
+    # The job's commits happen in the worker process, whose session events
+    # invalidate nothing here; drop this process's cache (or the shared Redis
+    # one) once a catalog-writing job has run, even partially
+    if kind in CLEARS_CACHE and not future.cancelled():
+        cache.backend.clear()
+
+def submit(job_id: int, kind: schemas.JobKindEnum):
+    future = get_executor().submit(run_job, job_id)
+    _futures[job_id] = future
+    future.add_done_callback(lambda f: _done(job_id, kind, f))
+
+def cancel(job_id: int) -> bool:
+    """Cancel a job that has not started yet; True if it was dequeued."""
+    future = _futures.get(job_id)
+    return future is not None and future.cancel()
+
+def owner():
+    # Computed per call: gunicorn workers fork after this module is imported
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+def _alive(owner_id):
+    host, _, pid = owner_id.rpartition(":")
+    if host != socket.gethostname() or sys.platform == "win32":
+        # Can't tell from here (and os.kill(pid, 0) terminates on Windows)
+        return True
+    try:
+        os.kill(int(pid), 0)
+    except ProcessLookupError:
+        return False
+    except (PermissionError, ValueError):
+        return True
+    return True
+
+def recover():
+    """Fail jobs left pending/running by an API process that no longer exists.
+
+    Their futures died with that process's pool, so nothing would ever
+    finish them.
+    """
+    db = SessionLocal()
+    try:
+        orphaned = db.query(models.Job).filter(
+            models.Job.status.in_([schemas.JobStatusEnum.PENDING.value, schemas.JobStatusEnum.RUNNING.value])
+        ).all()
+        for job in orphaned:
+            if job.owner is not None and (job.owner == owner() or _alive(job.owner)):
+                continue
+            job.status = schemas.JobStatusEnum.FAILED.value
+            job.error = "Interrupted: the server process that queued this job stopped"
+            job.finished_at = datetime.utcnow()
+        db.commit()
+    finally:
+        db.close()
+
+def shutdown():
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False, cancel_futures=True)
+            _executor = None
+
+    # Queued jobs were just dropped from the pool; running ones are left to
+    # recover() in the next process to start
+    db = SessionLocal()
+    try:
+        db.query(models.Job).filter(
+            models.Job.owner == owner(),
+            models.Job.status == schemas.JobStatusEnum.PENDING.value,
+        ).update({
+            models.Job.status: schemas.JobStatusEnum.CANCELLED.value,
+            models.Job.finished_at: datetime.utcnow(),
+        }, synchronize_session=False)
+        db.commit()
+    finally:
+        db.close()
@@ -1,27 +1,82 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from .routers import foods, nutrition, meals, profile, household_measures
-from .database import engine, Base
-from sqlalchemy import text
+from .routers import foods, nutrition, meals, profile, household_measures, recipes, catalog, intake as intake_router, jobs as jobs_router
+from . import models, jobs, cache, search, intake, goals
+from .idempotency import IdempotencyMiddleware
+from .compression import CompressionMiddleware, ContentNegotiationMiddleware, NegotiatedResponse
+from .database import engine, Base, SessionLocal
+from sqlalchemy import text, inspect
+
+has_intake_log = inspect(engine).has_table("intake_log")
+has_daily_intake = inspect(engine).has_table("daily_intake")
+has_item_snapshots = not inspect(engine).has_table("meal_items") or "energy_kcal" in {
+    column["name"] for column in inspect(engine).get_columns("meal_items")
+}
 
 # Create tables (if not exist, though we used import script)
 Base.metadata.create_all(bind=engine)
 
-# Lightweight migration: add 'description' column to foods if missing
+# Lightweight migrations: add columns if missing
+for statement in [
+    "ALTER TABLE foods ADD COLUMN description TEXT",
+    "ALTER TABLE meals ADD COLUMN user_id INTEGER",
+    "ALTER TABLE meals ADD COLUMN consumed_at TIMESTAMP",
+    "ALTER TABLE meal_items ADD COLUMN consumed_at TIMESTAMP",
+    *[f"ALTER TABLE meal_items ADD COLUMN {column} FLOAT" for column in models.NUTRIENT_COLUMNS],
+    "ALTER TABLE user_profiles ADD COLUMN goals_version INTEGER",
+    "ALTER TABLE jobs ADD COLUMN owner VARCHAR",
+]:
+    try:
+        with engine.begin() as conn:
+            conn.execute(text(statement))
+    except Exception:
+        # Column may already exist or DB may not support this form; ignore
+        pass
+
+# Meal items added before nutrient snapshots: take them from the foods as they are now
+if not has_item_snapshots:
+    with engine.begin() as conn:
+        intake.snapshot_existing(conn)
+
+# Meals recorded before the intake log / daily totals existed
+if not has_intake_log or not has_daily_intake:
+    db = SessionLocal()
+    try:
+        if not has_intake_log:
+            intake.backfill(db)
+        intake.refresh_daily(db.connection())
+        db.commit()
+    finally:
+        db.close()
+
+# Profiles saved with client-computed goals
+db = SessionLocal()
 try:
-    with engine.connect() as conn:
-        conn.execute(text("ALTER TABLE foods ADD COLUMN description TEXT"))
-except Exception:
-    # Column may already exist or DB may not support this form; ignore
-    pass
+    goals.backfill(db)
+finally:
+    db.close()
+
+# Food search index (SQLite FTS5; Postgres uses supabase/migrations)
+search.setup(engine)
 
 app = FastAPI(
     title="DietCalc API",
     description="API para cálculo nutricional baseada na tabela TACO",
-    version="0.1.0"
+    version="0.1.0",
+    # JSON, or MessagePack for clients sending Accept: application/msgpack
+    default_response_class=NegotiatedResponse,
 )
 
-# CORS (Allow all for dev)
+# Replays stored responses for retried writes carrying an Idempotency-Key
+app.add_middleware(IdempotencyMiddleware)
+
+# gzip/brotli for larger bodies, negotiated via Accept-Encoding
+app.add_middleware(CompressionMiddleware)
+app.add_middleware(ContentNegotiationMiddleware)
+
+# CORS (Allow all for dev). Added last so it is the outermost layer and the
+# responses the other middleware send themselves (e.g. idempotency 409/422)
+# carry the CORS headers too
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -35,7 +90,24 @@ app.include_router(nutrition.router)
 app.include_router(meals.router)
 app.include_router(profile.router)
 app.include_router(household_measures.router)
+app.include_router(recipes.router)
+app.include_router(catalog.router)
+app.include_router(intake_router.router)
+app.include_router(jobs_router.router)
+
+@app.on_event("startup")
+def recover_jobs():
+    # Runs in every worker, including ones recycled by --max-requests
+    jobs.recover()
+
+@app.on_event("shutdown")
+def shutdown_jobs():
+    jobs.shutdown()
 
 @app.get("/")
 def read_root():
     return {"message": "Welcome to DietCalc API"}
+
+@app.get("/cache/stats")
+def read_cache_stats():
+    return {**cache.backend.stats(), "coalesced": cache.coalesced}
@@ -1,7 +1,21 @@
-from sqlalchemy import Column, Integer, String, Float, ForeignKey
+from datetime import datetime
+from sqlalchemy import Column, Integer, String, Float, ForeignKey, Boolean, Date, DateTime, Text, LargeBinary, Index, UniqueConstraint
 from sqlalchemy.orm import relationship
 from .database import Base
 
+# Nutrient columns stored per `base_qty` of a Food, in TACO spreadsheet order
+NUTRIENT_COLUMNS = [
+    "humidity", "energy_kcal", "energy_kj", "protein", "lipid", "cholesterol",
+    "carbohydrate", "fiber", "ash",
+    "calcium", "magnesium", "manganese", "phosphorus", "iron", "sodium",
+    "potassium", "copper", "zinc",
+    "retinol", "re", "rae", "thiamin", "riboflavin", "pyridoxine", "niacin",
+    "vitamin_c",
+]
+
+# Single user for now (see UserProfile)
+DEFAULT_USER_ID = 1
+
 class Category(Base):
     __tablename__ = "categories"
 
@@ -71,6 +85,8 @@ class Meal(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String) # e.g. "Breakfast", "Lunch"
+    user_id = Column(Integer, default=DEFAULT_USER_ID, nullable=True)
+    consumed_at = Column(DateTime, default=datetime.utcnow, nullable=True, index=True)
     
     items = relationship("MealItem", back_populates="meal", cascade="all, delete-orphan")
 
@@ -81,10 +97,45 @@ class MealItem(Base):
     meal_id = Column(Integer, ForeignKey("meals.id"))
     food_id = Column(Integer, ForeignKey("foods.id"))
     quantity = Column(Float) # in grams
+    consumed_at = Column(DateTime, default=datetime.utcnow, nullable=True)
+    # Plus one column per nutrient (below): the food's values scaled to
+    # `quantity`, snapshotted when the item is added, so later edits to the
+    # food don't rewrite meal history
     
     meal = relationship("Meal", back_populates="items")
     food = relationship("Food")
 
+class IntakeLog(Base):
+    __tablename__ = "intake_log"
+    # Range scans for /intake/summary
+    __table_args__ = (Index("ix_intake_log_user_consumed_at", "user_id", "consumed_at"),)
+
+    # Append-only: adding a meal item appends its nutrients, removing it
+    # appends the negated values, so SUM over a range gives the net intake
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, default=DEFAULT_USER_ID)
+    consumed_at = Column(DateTime)
+    meal_id = Column(Integer, index=True)
+    meal_item_id = Column(Integer, index=True)
+    food_id = Column(Integer)
+    quantity = Column(Float) # grams, negative for reversals
+    logged_at = Column(DateTime, default=datetime.utcnow)
+
+class DailyIntake(Base):
+    __tablename__ = "daily_intake"
+    __table_args__ = (UniqueConstraint("user_id", "day", name="uq_daily_intake_user_day"),)
+
+    # Running per-user, per-day totals, refreshed from intake_log whenever
+    # a meal item of that day changes
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, default=DEFAULT_USER_ID)
+    day = Column(Date)
+    quantity = Column(Float) # grams
+
+for _model in (MealItem, IntakeLog, DailyIntake):
+    for _column in NUTRIENT_COLUMNS:
+        setattr(_model, _column, Column(_column, Float, nullable=True))
+
 class UserProfile(Base):
     __tablename__ = "user_profiles"
 
@@ -97,9 +148,74 @@ class UserProfile(Base):
     sex = Column(String)
     activity_level = Column(String)
     
-    # Goals
+    # Goals, derived from the fields above (see goals.py)
     goal_tmb = Column(Float)
     goal_get = Column(Float)
     goal_protein_g = Column(Float)
     goal_carbs_g = Column(Float)
     goal_fat_g = Column(Float)
+    goals_version = Column(Integer, nullable=True) # bumped whenever the goals are recomputed
+
+class Recipe(Base):
+    __tablename__ = "recipes"
+
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String, index=True)
+    description = Column(String, nullable=True)
+    yield_factor = Column(Float, default=1.0) # cooked weight / raw weight
+
+    # Cached per-100g profile, stored as a regular Food so the recipe can be
+    # used directly as a meal item
+    food_id = Column(Integer, ForeignKey("foods.id"))
+
+    food = relationship("Food")
+    ingredients = relationship("RecipeIngredient", back_populates="recipe", cascade="all, delete-orphan")
+
+class RecipeIngredient(Base):
+    __tablename__ = "recipe_ingredients"
+
+    id = Column(Integer, primary_key=True, index=True)
+    recipe_id = Column(Integer, ForeignKey("recipes.id"))
+    food_id = Column(Integer, ForeignKey("foods.id"), index=True)
+    quantity = Column(Float) # raw grams
+
+    recipe = relationship("Recipe", back_populates="ingredients")
+    food = relationship("Food")
+
+class CatalogChange(Base):
+    __tablename__ = "catalog_changes"
+
+    # Monotonic catalog version; clients sync with ?since=<version>
+    version = Column(Integer, primary_key=True, autoincrement=True)
+    entity = Column(String) # food, category, measure; "catalog" for a full reset
+    entity_id = Column(Integer, nullable=True)
+    op = Column(String) # upsert, delete, reset
+    changed_at = Column(DateTime, default=datetime.utcnow)
+
+class IdempotencyKey(Base):
+    __tablename__ = "idempotency_keys"
+
+    # sha256 of method, path and the client's Idempotency-Key header
+    key = Column(String(64), primary_key=True)
+    fingerprint = Column(String(64)) # sha256 of the Accept header and request body
+    status_code = Column(Integer, nullable=True) # NULL while the first request runs
+    headers = Column(Text, nullable=True) # JSON
+    body = Column(LargeBinary, nullable=True) # zlib-compressed
+    expires_at = Column(DateTime, index=True)
+
+class Job(Base):
+    __tablename__ = "jobs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    kind = Column(String, index=True) # e.g. "import_taco", "nutrition_batch"
+    status = Column(String, default="pending", index=True) # pending, running, succeeded, failed, cancelled
+    progress = Column(Float, default=0.0) # 0.0 - 1.0
+    params = Column(Text, nullable=True) # JSON
+    result = Column(Text, nullable=True) # JSON
+    error = Column(Text, nullable=True)
+    cancel_requested = Column(Boolean, default=False)
+    owner = Column(String, nullable=True) # "host:pid" of the API process that queued it
+
+    created_at = Column(DateTime, default=datetime.utcnow)
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
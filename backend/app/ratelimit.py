@@ -0,0 +1,57 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from fastapi import HTTPException, Request
+
+# Search-as-you-type budget per client: sustained requests/second and burst
+SEARCH_RATE = float(os.getenv("SEARCH_RATE", "5"))
+SEARCH_BURST = float(os.getenv("SEARCH_BURST", "20"))
+
+class TokenBucketLimiter:
+    """Per-client token bucket, usable as a FastAPI dependency.
+
+    With `param`, only requests carrying that query parameter are limited.
+    Buckets live in process memory, so each worker enforces its own budget.
+    """
+
+    def __init__(self, rate, burst, param=None, max_clients=10000, clock=time.monotonic):
+        self.rate = rate
+        self.burst = burst
+        self.param = param
+        self.max_clients = max_clients
+        self.clock = clock
+        self._buckets = OrderedDict() # client -> (tokens, updated_at)
+        self._lock = threading.Lock()
+
+    def acquire(self, client):
+        """Take one token; return 0 on success or the seconds to wait."""
+        now = self.clock()
+        with self._lock:
+            tokens, updated_at = self._buckets.pop(client, (self.burst, now))
+            tokens = min(self.burst, tokens + (now - updated_at) * self.rate)
+            if tokens >= 1:
+                tokens -= 1
+                wait = 0.0
+            else:
+                wait = (1 - tokens) / self.rate
+            self._buckets[client] = (tokens, now)
+            # Forget the least recently seen clients
+            while len(self._buckets) > self.max_clients:
+                self._buckets.popitem(last=False)
+        return wait
+
+    def __call__(self, request: Request):
+        if self.param and not request.query_params.get(self.param):
+            return
+        client = request.client.host if request.client else "unknown"
+        wait = self.acquire(client)
+        if wait:
+            raise HTTPException(
+                status_code=429,
+                detail="Too many requests",
+                headers={"Retry-After": str(max(1, round(wait)))},
+            )
+
+search_limiter = TokenBucketLimiter(SEARCH_RATE, SEARCH_BURST, param="search")
@@ -0,0 +1,100 @@
+from sqlalchemy.orm import Session
+from . import models
+
+def compute_profile(recipe: models.Recipe):
+    """Recompute the cached per-100g profile of a recipe from its ingredients."""
+    totals = dict.fromkeys(models.NUTRIENT_COLUMNS)
+    raw_weight = 0.0
+
+    for ingredient in recipe.ingredients:
+        raw_weight += ingredient.quantity
+        food = ingredient.food
+        if food is None:
+            continue
+        base_qty = food.base_qty or 100.0
+        for column in models.NUTRIENT_COLUMNS:
+            value = getattr(food, column)
+            if value is not None:
+                totals[column] = (totals[column] or 0.0) + value * ingredient.quantity / base_qty
+
+    cooked_weight = raw_weight * (recipe.yield_factor or 1.0)
+
+    # Cooking gains or loses water, not solids
+    if totals["humidity"] is not None:
+        totals["humidity"] = max(totals["humidity"] + cooked_weight - raw_weight, 0.0)
+
+    food = recipe.food
+    food.name = recipe.name
+    food.description = recipe.description
+    food.base_qty = 100.0
+    food.base_unit = "g"
+    for column, total in totals.items():
+        if total is None or not cooked_weight:
+            setattr(food, column, None)
+        else:
+            setattr(food, column, total * 100.0 / cooked_weight)
+
+def contains(db: Session, food_ids, target_food_id) -> bool:
+    """True if `target_food_id` is one of `food_ids` or (transitively) an
+    ingredient of a recipe among them."""
+    pending = list(food_ids)
+    seen = set()
+    while pending:
+        current = pending.pop()
+        if current == target_food_id:
+            return True
+        if current in seen:
+            continue
+        seen.add(current)
+        pending.extend(
+            food_id for (food_id,) in
+            db.query(models.RecipeIngredient.food_id)
+            .join(models.Recipe)
+            .filter(models.Recipe.food_id == current)
+        )
+    return False
+
+def refresh_recipes_using(db: Session, food_id: int):
+    """Recompute only the recipes that (transitively) contain a food.
+
+    Call after a food is updated or deleted; the caller commits.
+    """
+    pending = [food_id]
+    seen = set()
+    while pending:
+        current = pending.pop()
+        if current in seen:
+            continue
+        seen.add(current)
+
+        recipes = (
+            db.query(models.Recipe)
+            .join(models.RecipeIngredient)
+            .filter(models.RecipeIngredient.food_id == current)
+            .all()
+        )
+        for recipe in recipes:
+            compute_profile(recipe)
+            # A recipe can itself be an ingredient of other recipes
+            pending.append(recipe.food_id)
+
+def refresh_all(db: Session):
+    """Recompute every recipe, ingredient recipes first (e.g. after a TACO
+    re-import changed many foods at once). The caller commits.
+    """
+    all_recipes = db.query(models.Recipe).all()
+    by_food = {recipe.food_id: recipe for recipe in all_recipes}
+    done = set()
+
+    def compute(recipe):
+        if recipe.id in done:
+            return
+        done.add(recipe.id)
+        for ingredient in recipe.ingredients:
+            if ingredient.food_id in by_food:
+                compute(by_food[ingredient.food_id])
+        compute_profile(recipe)
+        db.flush()
+
+    for recipe in all_recipes:
+        compute(recipe)
@@ -0,0 +1,30 @@
+from fastapi import APIRouter, Depends, Request, Response
+from sqlalchemy.orm import Session
+import gzip
+from .. import schemas, database, catalog
+
+router = APIRouter(
+    prefix="/catalog",
+    tags=["catalog"]
+)
+
+@router.get("/snapshot")
+def read_snapshot(request: Request, db: Session = Depends(database.get_db)):
+    # All foods, categories and household measures as gzipped JSON; the
+    # ETag is the catalog version to pass to /catalog/changes later
+    version, data = catalog.snapshot(db)
+    etag = f'"{version}"'
+    headers = {"ETag": etag, "Cache-Control": "no-cache", "Vary": "Accept-Encoding"}
+
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+
+    if "gzip" in request.headers.get("accept-encoding", ""):
+        headers["Content-Encoding"] = "gzip"
+    else:
+        data = gzip.decompress(data)
+    return Response(content=data, media_type="application/json", headers=headers)
+
+@router.get("/changes", response_model=schemas.CatalogChanges)
+def read_changes(since: int = 0, db: Session = Depends(database.get_db)):
+    return catalog.changes_since(db, since)
@@ -1,14 +1,22 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 from typing import List, Optional
-from .. import models, schemas, database
+from .. import models, schemas, database, export, recipes, search as food_search
+from ..cache import cached, single_flight
+from ..ratelimit import search_limiter
 
 router = APIRouter(
     prefix="/foods",
     tags=["foods"]
 )
 
-@router.get("/", response_model=List[schemas.Food])
+@router.get("/", response_model=List[schemas.Food], dependencies=[Depends(search_limiter)])
+@single_flight(
+    "foods:list",
+    key=lambda skip, limit, search, category_id, **_: (skip, limit, search, category_id),
+    model=List[schemas.Food],
+)
 def read_foods(
     skip: int = 0, 
     limit: int = 100, 
@@ -19,7 +27,8 @@ def read_foods(
     query = db.query(models.Food)
     
     if search:
-        query = query.filter(models.Food.name.ilike(f"%{search}%"))
+        # Relevance-ranked when the database has a search index
+        query = food_search.apply(query, db.get_bind(), search)
     
     if category_id:
         query = query.filter(models.Food.category_id == category_id)
@@ -27,12 +36,40 @@ def read_foods(
     foods = query.offset(skip).limit(limit).all()
     return foods
 
+@router.get("/export")
+def export_foods(
+    format: schemas.ExportFormatEnum = schemas.ExportFormatEnum.CSV,
+    search: Optional[str] = None,
+    category_id: Optional[int] = None,
+):
+    # Every column of the catalog, nutrients included, streamed in chunks
+    statement = select(
+        models.Food.id,
+        models.Food.name,
+        models.Food.category_id,
+        models.Food.description,
+        models.Food.base_qty,
+        models.Food.base_unit,
+        *[getattr(models.Food, column) for column in models.NUTRIENT_COLUMNS],
+    )
+
+    if search:
+        # Same matching and ranking as GET /foods/?search=
+        statement = food_search.apply(statement, database.engine, search)
+    statement = statement.order_by(models.Food.id)
+
+    if category_id:
+        statement = statement.where(models.Food.category_id == category_id)
+
+    return export.stream_export(statement, format, "foods")
+
 @router.get("/categories", response_model=List[schemas.CategorySimple])
+@cached("foods:categories", tags=lambda **_: ["categories"], model=List[schemas.CategorySimple])
 def read_categories(db: Session = Depends(database.get_db)):
     categories = db.query(models.Category).all()
     return categories
 
-@router.get("/{food_id}", response_model=schemas.Food)
+@router.get("/{food_id}", response_model=schemas.FoodDetail)
 def read_food(food_id: int, db: Session = Depends(database.get_db)):
     food = db.query(models.Food).filter(models.Food.id == food_id).first()
     if food is None:
@@ -62,11 +99,16 @@ def update_food(food_id: int, updates: schemas.FoodUpdate, db: Session = Depends
     db_food = db.query(models.Food).filter(models.Food.id == food_id).first()
     if not db_food:
         raise HTTPException(status_code=404, detail="Food not found")
+    if db.query(models.Recipe).filter(models.Recipe.food_id == food_id).first():
+        # Its profile is derived from the ingredients; edit the recipe instead
+        raise HTTPException(status_code=409, detail="Food belongs to a recipe")
 
     data = updates.dict(exclude_unset=True)
     for key, value in data.items():
         setattr(db_food, key, value)
 
+    # Keep cached profiles of recipes containing this food in sync
+    recipes.refresh_recipes_using(db, food_id)
     db.commit()
     db.refresh(db_food)
     return db_food
@@ -76,6 +118,11 @@ def delete_food(food_id: int, db: Session = Depends(database.get_db)):
     db_food = db.query(models.Food).filter(models.Food.id == food_id).first()
     if not db_food:
         raise HTTPException(status_code=404, detail="Food not found")
+    if db.query(models.Recipe).filter(models.Recipe.food_id == food_id).first():
+        # Delete the recipe instead
+        raise HTTPException(status_code=409, detail="Food belongs to a recipe")
     db.delete(db_food)
+    db.flush()
+    recipes.refresh_recipes_using(db, food_id)
     db.commit()
     return {"ok": True}
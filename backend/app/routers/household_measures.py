@@ -2,6 +2,7 @@ from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 from typing import List
 from .. import models, schemas, database
+from ..cache import cached
 
 router = APIRouter(
     prefix="/measures",
@@ -9,6 +10,12 @@ router = APIRouter(
 )
 
 @router.get("/{food_id}", response_model=List[schemas.HouseholdMeasure])
+@cached(
+    "measures",
+    key=lambda food_id, **_: (food_id,),
+    tags=lambda food_id, **_: [f"measures:{food_id}"],
+    model=List[schemas.HouseholdMeasure],
+)
 def read_measures(food_id: int, db: Session = Depends(database.get_db)):
     measures = db.query(models.HouseholdMeasure).filter(models.HouseholdMeasure.food_id == food_id).all()
     return measures
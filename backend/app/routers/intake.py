@@ -0,0 +1,29 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+from datetime import date, timedelta
+from typing import List, Optional
+from .. import models, schemas, database, intake
+
+router = APIRouter(
+    prefix="/intake",
+    tags=["intake"]
+)
+
+@router.get("/summary", response_model=List[schemas.IntakeBucket])
+def read_intake_summary(
+    start: Optional[date] = Query(None, alias="from"),
+    end: Optional[date] = Query(None, alias="to"),
+    bucket: schemas.IntakeBucketEnum = schemas.IntakeBucketEnum.DAY,
+    user_id: int = models.DEFAULT_USER_ID,
+    db: Session = Depends(database.get_db)
+):
+    # `to` is inclusive
+    rows = intake.summary(db, user_id, start, end + timedelta(days=1) if end else None, bucket.value)
+    return [
+        schemas.IntakeBucket(
+            period=row[0],
+            quantity=row[1] or 0.0,
+            nutrients=dict(zip(models.NUTRIENT_COLUMNS, row[2:])),
+        )
+        for row in rows
+    ]
@@ -0,0 +1,54 @@
+import json
+from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+from typing import List
+from .. import models, schemas, database, jobs
+
+router = APIRouter(
+    prefix="/jobs",
+    tags=["jobs"]
+)
+
+@router.post("/", response_model=schemas.Job)
+def create_job(job: schemas.JobCreate, db: Session = Depends(database.get_db)):
+    db_job = models.Job(
+        kind=job.kind.value,
+        status=schemas.JobStatusEnum.PENDING.value,
+        progress=0.0,
+        params=json.dumps(job.params),
+        owner=jobs.owner(),
+    )
+    db.add(db_job)
+    db.commit()
+    db.refresh(db_job)
+
+    jobs.submit(db_job.id, job.kind)
+    return db_job
+
+@router.get("/", response_model=List[schemas.Job])
+def read_jobs(skip: int = 0, limit: int = 100, db: Session = Depends(database.get_db)):
+    return db.query(models.Job).order_by(models.Job.id.desc()).offset(skip).limit(limit).all()
+
+@router.get("/{job_id}", response_model=schemas.Job)
+def read_job(job_id: int, db: Session = Depends(database.get_db)):
+    job = db.query(models.Job).filter(models.Job.id == job_id).first()
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+@router.post("/{job_id}/cancel", response_model=schemas.Job)
+def cancel_job(job_id: int, db: Session = Depends(database.get_db)):
+    job = db.query(models.Job).filter(models.Job.id == job_id).first()
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    if job.status in (schemas.JobStatusEnum.PENDING.value, schemas.JobStatusEnum.RUNNING.value):
+        # Running jobs stop at their next progress report
+        job.cancel_requested = True
+        if jobs.cancel(job_id):
+            job.status = schemas.JobStatusEnum.CANCELLED.value
+            job.finished_at = datetime.utcnow()
+        db.commit()
+        db.refresh(job)
+    return job
@@ -1,7 +1,10 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
+from datetime import date, datetime, timedelta
+from sqlalchemy import select, func
 from sqlalchemy.orm import Session
-from typing import List
-from .. import models, schemas, database
+from typing import List, Optional
+from .. import models, schemas, database, export
+from ..cache import cached
 
 router = APIRouter(
     prefix="/meals",
@@ -10,7 +13,7 @@ router = APIRouter(
 
 @router.post("/", response_model=schemas.Meal)
 def create_meal(meal: schemas.MealCreate, db: Session = Depends(database.get_db)):
-    db_meal = models.Meal(name=meal.name)
+    db_meal = models.Meal(name=meal.name, consumed_at=meal.consumed_at or datetime.utcnow())
     db.add(db_meal)
     db.commit()
     db.refresh(db_meal)
@@ -19,7 +22,8 @@ def create_meal(meal: schemas.MealCreate, db: Session = Depends(database.get_db)
         db_item = models.MealItem(
             meal_id=db_meal.id,
             food_id=item.food_id,
-            quantity=item.quantity
+            quantity=item.quantity,
+            consumed_at=item.consumed_at or db_meal.consumed_at
         )
         db.add(db_item)
     
@@ -32,6 +36,47 @@ def read_meals(skip: int = 0, limit: int = 100, db: Session = Depends(database.g
     meals = db.query(models.Meal).offset(skip).limit(limit).all()
     return meals
 
+@router.get("/export")
+def export_meals(
+    format: schemas.ExportFormatEnum = schemas.ExportFormatEnum.NDJSON,
+    meal_id: Optional[int] = None,
+    user_id: Optional[int] = None,
+    start: Optional[date] = Query(None, alias="from"),
+    end: Optional[date] = Query(None, alias="to"),
+):
+    # One row per meal item, with the nutrients snapshotted for its quantity
+    snapshot = [getattr(models.MealItem, column) for column in models.NUTRIENT_COLUMNS]
+    statement = (
+        select(
+            models.Meal.id.label("meal_id"),
+            models.Meal.name.label("meal_name"),
+            models.Meal.user_id,
+            models.MealItem.id.label("item_id"),
+            models.MealItem.consumed_at,
+            models.MealItem.food_id,
+            models.Food.name.label("food_name"),
+            models.MealItem.quantity,
+            *snapshot,
+        )
+        .join(models.MealItem, models.MealItem.meal_id == models.Meal.id)
+        .outerjoin(models.Food, models.Food.id == models.MealItem.food_id)
+        .order_by(models.Meal.id, models.MealItem.id)
+    )
+
+    if meal_id:
+        statement = statement.where(models.Meal.id == meal_id)
+
+    if user_id:
+        statement = statement.where(models.Meal.user_id == user_id)
+
+    if start:
+        statement = statement.where(models.MealItem.consumed_at >= start)
+
+    if end:
+        statement = statement.where(models.MealItem.consumed_at < end + timedelta(days=1))
+
+    return export.stream_export(statement, format, "meals")
+
 @router.get("/{meal_id}", response_model=schemas.Meal)
 def read_meal(meal_id: int, db: Session = Depends(database.get_db)):
     meal = db.query(models.Meal).filter(models.Meal.id == meal_id).first()
@@ -39,6 +84,36 @@ def read_meal(meal_id: int, db: Session = Depends(database.get_db)):
         raise HTTPException(status_code=404, detail="Meal not found")
     return meal
 
+@router.get("/{meal_id}/totals", response_model=schemas.MealTotals)
+@cached(
+    "meals:totals",
+    key=lambda meal_id, **_: (meal_id,),
+    # Snapshotted nutrients: food edits don't change the totals
+    tags=lambda result, meal_id, **_: [f"meal:{meal_id}"],
+)
+def read_meal_totals(meal_id: int, db: Session = Depends(database.get_db)):
+    meal = db.query(models.Meal).filter(models.Meal.id == meal_id).first()
+    if meal is None:
+        raise HTTPException(status_code=404, detail="Meal not found")
+
+    sums = [func.sum(getattr(models.MealItem, column)) for column in models.NUTRIENT_COLUMNS]
+    row = (
+        db.query(func.coalesce(func.sum(models.MealItem.quantity), 0.0), *sums)
+        .filter(models.MealItem.meal_id == meal_id)
+        .one()
+    )
+    food_ids = [
+        food_id for (food_id,) in
+        db.query(models.MealItem.food_id).filter(models.MealItem.meal_id == meal_id).distinct()
+    ]
+
+    return schemas.MealTotals(
+        meal_id=meal_id,
+        quantity=row[0],
+        food_ids=food_ids,
+        nutrients=dict(zip(models.NUTRIENT_COLUMNS, row[1:])),
+    )
+
 @router.delete("/{meal_id}")
 def delete_meal(meal_id: int, db: Session = Depends(database.get_db)):
     meal = db.query(models.Meal).filter(models.Meal.id == meal_id).first()
@@ -58,7 +133,8 @@ def add_item_to_meal(meal_id: int, item: schemas.MealItemCreate, db: Session = D
     db_item = models.MealItem(
         meal_id=meal_id,
         food_id=item.food_id,
-        quantity=item.quantity
+        quantity=item.quantity,
+        consumed_at=item.consumed_at or meal.consumed_at
     )
     db.add(db_item)
     db.commit()
@@ -1,5 +1,6 @@
 from fastapi import APIRouter, HTTPException
 from .. import schemas
+from ..cache import cached
 
 router = APIRouter(
     prefix="/nutrition",
@@ -7,6 +8,7 @@ router = APIRouter(
 )
 
 @router.post("/calculate", response_model=schemas.NutritionCalculationResponse)
+@cached("nutrition:calculate", key=lambda data: (data,), ttl=24 * 3600)
 def calculate_nutrition(data: schemas.NutritionCalculationRequest):
     # Mifflin-St Jeor Formula
     # Men: (10 x weight) + (6.25 x height) - (5 x age) + 5
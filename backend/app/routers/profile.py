@@ -1,6 +1,8 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
-from .. import models, schemas, database
+from datetime import date, datetime
+from typing import Optional
+from .. import models, schemas, database, adherence
 
 router = APIRouter(
     prefix="/profile",
@@ -15,8 +17,25 @@ def get_profile(db: Session = Depends(database.get_db)):
         raise HTTPException(status_code=404, detail="Profile not set")
     return profile
 
+@router.get("/adherence", response_model=schemas.AdherenceReport)
+def get_adherence(day: Optional[date] = None, db: Session = Depends(database.get_db)):
+    profile = db.query(models.UserProfile).first()
+    if not profile:
+        raise HTTPException(status_code=404, detail="Profile not set")
+
+    # Totals are maintained per day on every meal item change and the goals
+    # are stored on the profile, so this is two row reads (not cached: any
+    # cache key would cost as much)
+    day = day or datetime.utcnow().date()
+    daily = db.query(models.DailyIntake).filter(
+        models.DailyIntake.user_id == models.DEFAULT_USER_ID,
+        models.DailyIntake.day == day,
+    ).first()
+    return adherence.score(profile, daily, day)
+
 @router.post("/", response_model=schemas.UserProfile)
 def create_or_update_profile(profile_data: schemas.UserProfileCreate, db: Session = Depends(database.get_db)):
+    # Goals are derived from these fields when the profile is flushed
     profile = db.query(models.UserProfile).first()
     if not profile:
         profile = models.UserProfile(**profile_data.dict())
@@ -24,7 +43,7 @@ def create_or_update_profile(profile_data: schemas.UserProfileCreate, db: Sessio
     else:
         for key, value in profile_data.dict().items():
             setattr(profile, key, value)
-    
+
     db.commit()
     db.refresh(profile)
     return profile
@@ -0,0 +1,80 @@
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+from typing import List
+from .. import models, schemas, database, recipes
+
+router = APIRouter(
+    prefix="/recipes",
+    tags=["recipes"]
+)
+
+def set_ingredients(db: Session, recipe: models.Recipe, ingredients: List[schemas.RecipeIngredientCreate]):
+    food_ids = {item.food_id for item in ingredients}
+    if recipes.contains(db, food_ids, recipe.food_id):
+        raise HTTPException(status_code=400, detail="Recipe cannot contain itself")
+    found = db.query(models.Food.id).filter(models.Food.id.in_(food_ids)).count()
+    if found != len(food_ids):
+        raise HTTPException(status_code=404, detail="Food not found")
+
+    recipe.ingredients = [
+        models.RecipeIngredient(food_id=item.food_id, quantity=item.quantity)
+        for item in ingredients
+    ]
+    db.flush()
+    recipes.compute_profile(recipe)
+
+@router.post("/", response_model=schemas.Recipe)
+def create_recipe(recipe: schemas.RecipeCreate, db: Session = Depends(database.get_db)):
+    db_food = models.Food(name=recipe.name, description=recipe.description)
+    db_recipe = models.Recipe(
+        name=recipe.name,
+        description=recipe.description,
+        yield_factor=recipe.yield_factor,
+        food=db_food,
+    )
+    db.add(db_recipe)
+    db.flush()
+
+    set_ingredients(db, db_recipe, recipe.ingredients)
+    db.commit()
+    db.refresh(db_recipe)
+    return db_recipe
+
+@router.get("/", response_model=List[schemas.Recipe])
+def read_recipes(skip: int = 0, limit: int = 100, db: Session = Depends(database.get_db)):
+    return db.query(models.Recipe).offset(skip).limit(limit).all()
+
+@router.get("/{recipe_id}", response_model=schemas.Recipe)
+def read_recipe(recipe_id: int, db: Session = Depends(database.get_db)):
+    recipe = db.query(models.Recipe).filter(models.Recipe.id == recipe_id).first()
+    if recipe is None:
+        raise HTTPException(status_code=404, detail="Recipe not found")
+    return recipe
+
+@router.put("/{recipe_id}", response_model=schemas.Recipe)
+def update_recipe(recipe_id: int, recipe: schemas.RecipeCreate, db: Session = Depends(database.get_db)):
+    db_recipe = db.query(models.Recipe).filter(models.Recipe.id == recipe_id).first()
+    if db_recipe is None:
+        raise HTTPException(status_code=404, detail="Recipe not found")
+
+    db_recipe.name = recipe.name
+    db_recipe.description = recipe.description
+    db_recipe.yield_factor = recipe.yield_factor
+    set_ingredients(db, db_recipe, recipe.ingredients)
+
+    # Recipes using this one as an ingredient
+    recipes.refresh_recipes_using(db, db_recipe.food_id)
+    db.commit()
+    db.refresh(db_recipe)
+    return db_recipe
+
+@router.delete("/{recipe_id}")
+def delete_recipe(recipe_id: int, db: Session = Depends(database.get_db)):
+    recipe = db.query(models.Recipe).filter(models.Recipe.id == recipe_id).first()
+    if recipe is None:
+        raise HTTPException(status_code=404, detail="Recipe not found")
+
+    # The cached food stays so meal items that reference it keep their values
+    db.delete(recipe)
+    db.commit()
+    return {"ok": True}
@@ -1,5 +1,7 @@
-from pydantic import BaseModel, Field
-from typing import Optional, List, Dict
+import json
+from pydantic import BaseModel, Field, validator
+from typing import Optional, List, Dict, Any
+from datetime import datetime, date
 from enum import Enum
 
 class FoodBase(BaseModel):
@@ -19,6 +21,40 @@ class Food(FoodBase):
     class Config:
         orm_mode = True
 
+class FoodDetail(Food):
+    # Full TACO profile (per base_qty); energy_kcal, protein, carbohydrate
+    # and lipid are inherited from FoodBase
+    humidity: Optional[float]
+    energy_kj: Optional[float]
+    cholesterol: Optional[float]
+    fiber: Optional[float]
+    ash: Optional[float]
+
+    calcium: Optional[float]
+    magnesium: Optional[float]
+    manganese: Optional[float]
+    phosphorus: Optional[float]
+    iron: Optional[float]
+    sodium: Optional[float]
+    potassium: Optional[float]
+    copper: Optional[float]
+    zinc: Optional[float]
+
+    retinol: Optional[float]
+    re: Optional[float]
+    rae: Optional[float]
+    thiamin: Optional[float]
+    riboflavin: Optional[float]
+    pyridoxine: Optional[float]
+    niacin: Optional[float]
+    vitamin_c: Optional[float]
+
+class ExportFormatEnum(str, Enum):
+    CSV = "csv"
+    NDJSON = "ndjson"
+    PARQUET = "parquet"
+    ARROW = "arrow"
+
 class FoodCreate(BaseModel):
     name: str
     description: str
@@ -95,6 +131,7 @@ class NutritionCalculationResponse(BaseModel):
 class MealItemBase(BaseModel):
     food_id: int
     quantity: float = Field(..., gt=0, description="Quantity in grams")
+    consumed_at: Optional[datetime] = None # defaults to the meal's
 
 class MealItemCreate(MealItemBase):
     pass
@@ -104,11 +141,19 @@ class MealItem(MealItemBase):
     meal_id: int
     food: Optional[Food] = None
 
+    # Snapshotted for `quantity` when the item was added, so they don't
+    # follow later edits to the food (full profile: /meals/{id}/totals)
+    energy_kcal: Optional[float]
+    protein: Optional[float]
+    carbohydrate: Optional[float]
+    lipid: Optional[float]
+
     class Config:
         orm_mode = True
 
 class MealBase(BaseModel):
     name: str
+    consumed_at: Optional[datetime] = None # defaults to now
 
 class MealCreate(MealBase):
     items: List[MealItemCreate] = []
@@ -120,6 +165,56 @@ class Meal(MealBase):
     class Config:
         orm_mode = True
 
+class MealTotals(BaseModel):
+    meal_id: int
+    quantity: float # total grams
+    food_ids: List[int] = []
+    nutrients: Dict[str, Optional[float]]
+
+# Intake History Schemas
+
+class IntakeBucketEnum(str, Enum):
+    DAY = "day"
+    WEEK = "week"
+    MONTH = "month"
+
+class IntakeBucket(BaseModel):
+    period: date # first day of the bucket
+    quantity: float # total grams
+    nutrients: Dict[str, Optional[float]]
+
+# Recipe Schemas
+
+class RecipeIngredientBase(BaseModel):
+    food_id: int
+    quantity: float = Field(..., gt=0, description="Raw quantity in grams")
+
+class RecipeIngredientCreate(RecipeIngredientBase):
+    pass
+
+class RecipeIngredient(RecipeIngredientBase):
+    id: int
+
+    class Config:
+        orm_mode = True
+
+class RecipeBase(BaseModel):
+    name: str
+    description: Optional[str] = None
+    yield_factor: float = Field(1.0, gt=0, description="Cooked weight / raw weight")
+
+class RecipeCreate(RecipeBase):
+    ingredients: List[RecipeIngredientCreate] = []
+
+class Recipe(RecipeBase):
+    id: int
+    food_id: int
+    ingredients: List[RecipeIngredient] = []
+    food: Optional[FoodDetail] = None
+
+    class Config:
+        orm_mode = True
+
 # User Profile Schemas
 
 class UserProfileBase(BaseModel):
@@ -129,12 +224,6 @@ class UserProfileBase(BaseModel):
     height: float
     sex: SexEnum
     activity_level: ActivityLevelEnum
-    
-    goal_tmb: float
-    goal_get: float
-    goal_protein_g: float
-    goal_carbs_g: float
-    goal_fat_g: float
 
 class UserProfileCreate(UserProfileBase):
     pass
@@ -142,9 +231,37 @@ class UserProfileCreate(UserProfileBase):
 class UserProfile(UserProfileBase):
     id: int
 
+    # Computed by the server from the fields above
+    goal_tmb: float
+    goal_get: float
+    goal_protein_g: float
+    goal_carbs_g: float
+    goal_fat_g: float
+    goals_version: int
+
     class Config:
         orm_mode = True
 
+class MacroAdherence(BaseModel):
+    nutrient: str
+    intake: float
+    goal: Optional[float]
+    deviation: Optional[float] # (intake - goal) / goal
+
+class MicronutrientStatus(BaseModel):
+    nutrient: str
+    intake: float
+    reference: float # RDA/AI, or upper limit for excesses
+    unit: str
+    pct: float
+
+class AdherenceReport(BaseModel):
+    day: date
+    score: Optional[float] # 0-100
+    macros: List[MacroAdherence]
+    deficits: List[MicronutrientStatus] = []
+    excesses: List[MicronutrientStatus] = []
+
 # Household Measure Schemas
 
 class HouseholdMeasureBase(BaseModel):
@@ -160,3 +277,57 @@ class HouseholdMeasure(HouseholdMeasureBase):
 
     class Config:
         orm_mode = True
+
+# Catalog Sync Schemas
+
+class CatalogChanges(BaseModel):
+    version: int
+    # True when the log can't be replayed from `since` (e.g. after a TACO
+    # re-import); the client must download a new snapshot
+    reset: bool = False
+    foods: List[FoodDetail] = []
+    categories: List[CategorySimple] = []
+    measures: List[HouseholdMeasure] = []
+    deleted: Dict[str, List[int]] = {}
+
+# Job Schemas
+
+class JobKindEnum(str, Enum):
+    IMPORT_TACO = "import_taco"
+    SEED_MEASURES = "seed_measures"
+    MIGRATE_TO_POSTGRES = "migrate_to_postgres"
+    NUTRITION_BATCH = "nutrition_batch"
+
+class JobStatusEnum(str, Enum):
+    PENDING = "pending"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+class JobCreate(BaseModel):
+    kind: JobKindEnum
+    params: Dict[str, Any] = {}
+
+class Job(BaseModel):
+    id: int
+    kind: JobKindEnum
+    status: JobStatusEnum
+    progress: float
+    params: Optional[Any] = None
+    result: Optional[Any] = None
+    error: Optional[str] = None
+    cancel_requested: bool = False
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    @validator("params", "result", pre=True)
+    def parse_json(cls, value):
+        # Stored as JSON text in the jobs table
+        if isinstance(value, str):
+            return json.loads(value)
+        return value
+
+    class Config:
+        orm_mode = True
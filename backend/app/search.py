@@ -0,0 +1,108 @@
+import re
+
+from sqlalchemy import func, inspect, literal_column, table, column, text
+from sqlalchemy.exc import OperationalError
+
+from . import models
+
+# Indexed food search. Postgres uses the `search_vector` column and trigram
+# index from supabase/migrations; SQLite uses an FTS5 table kept in sync by
+# triggers. Anything else (or a database without them) falls back to ILIKE.
+
+FTS_TABLE = "foods_fts"
+PG_TS_CONFIG = "portuguese_unaccent"
+
+_SQLITE_TRIGGERS = {
+    "foods_fts_ai": f"""
+        CREATE TRIGGER foods_fts_ai AFTER INSERT ON foods BEGIN
+            INSERT INTO {FTS_TABLE}(rowid, name, description) VALUES (new.id, new.name, new.description);
+        END""",
+    "foods_fts_ad": f"""
+        CREATE TRIGGER foods_fts_ad AFTER DELETE ON foods BEGIN
+            INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name, description) VALUES ('delete', old.id, old.name, old.description);
+        END""",
+    "foods_fts_au": f"""
+        CREATE TRIGGER foods_fts_au AFTER UPDATE OF name, description ON foods BEGIN
+            INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name, description) VALUES ('delete', old.id, old.name, old.description);
+            INSERT INTO {FTS_TABLE}(rowid, name, description) VALUES (new.id, new.name, new.description);
+        END""",
+}
+
+_backends = {}
+
+def setup(engine):
+    """Create the SQLite FTS5 index and triggers if missing (no-op elsewhere).
+
+    When the triggers are missing (first run) the index is rebuilt from the
+    foods table.
+    """
+    _backends.pop(engine.url, None)
+    if engine.dialect.name != "sqlite":
+        return
+    try:
+        with engine.begin() as conn:
+            conn.execute(text(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+                "name, description, content='foods', content_rowid='id', "
+                "tokenize='unicode61 remove_diacritics 2')"
+            ))
+            existing = {
+                name for (name,) in conn.execute(
+                    text("SELECT name FROM sqlite_master WHERE type = 'trigger' AND tbl_name = 'foods'")
+                )
+            }
+            missing = [name for name in _SQLITE_TRIGGERS if name not in existing]
+            for name in missing:
+                conn.execute(text(_SQLITE_TRIGGERS[name]))
+            if missing:
+                conn.execute(text(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"))
+    except OperationalError:
+        # SQLite built without FTS5
+        pass
+
+def backend_for(engine):
+    if engine.url not in _backends:
+        tables = inspect(engine).get_table_names()
+        if engine.dialect.name == "postgresql":
+            columns = {c["name"] for c in inspect(engine).get_columns("foods")}
+            backend = "postgres" if "search_vector" in columns else "like"
+        elif engine.dialect.name == "sqlite" and FTS_TABLE in tables:
+            backend = "fts5"
+        else:
+            backend = "like"
+        _backends[engine.url] = backend
+    return _backends[engine.url]
+
+def _terms(search):
+    return re.findall(r"\w+", search.lower())
+
+def apply(query, engine, search):
+    """Filter a Food query (or a select from foods) by `search`, most relevant first."""
+    backend = backend_for(engine)
+    terms = _terms(search)
+
+    if backend == "postgres" and terms:
+        # Prefix match on every term so partial words (as typed) still hit
+        ts_query = func.to_tsquery(PG_TS_CONFIG, " & ".join(f"{term}:*" for term in terms))
+        search_vector = literal_column("foods.search_vector")
+        normalized_name = func.immutable_unaccent(func.lower(models.Food.name))
+        normalized_search = func.immutable_unaccent(search.lower())
+        # Word similarity (%>, <->>) compares the search with the closest
+        # stretch of the name: plain similarity (%) against a long TACO name
+        # rarely reaches the threshold for a short, possibly misspelt query
+        return query.filter(
+            search_vector.op("@@")(ts_query) | normalized_name.op("%>")(normalized_search)
+        ).order_by(
+            func.ts_rank(search_vector, ts_query).desc(),
+            normalized_name.op("<->>")(normalized_search),
+            models.Food.id,
+        )
+
+    if backend == "fts5" and terms:
+        fts = table(FTS_TABLE, column("rowid"))
+        match = " ".join(f'"{term}"*' for term in terms)
+        return query.join(fts, fts.c.rowid == models.Food.id).filter(
+            literal_column(FTS_TABLE).op("MATCH")(match)
+        ).order_by(text(f"bm25({FTS_TABLE})"), models.Food.id)
+
+    return query.filter(models.Food.name.ilike(f"%{search}%"))
@@ -0,0 +1,145 @@
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+# Add the parent directory to sys.path to allow importing app
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Every subcommand imports what it needs when it runs, so `--help` and the
+# light subcommands never pay for the database layer or spreadsheet readers.
+
+HEAVY_MODULES = ("pandas", "numpy", "openpyxl")
+
+def default_file():
+    from backend import import_taco
+
+    return import_taco.DEFAULT_FILE_PATH
+
+def cmd_import(args):
+    from backend import import_taco
+
+    result = import_taco.import_data(args.file or default_file(), sheet=args.sheet)
+    return 0 if result is not None else 1
+
+def cmd_inspect(args):
+    from backend import spreadsheet
+
+    file_path = args.file or default_file()
+    if not os.path.exists(file_path):
+        print(f"File not found: {file_path}")
+        return 1
+
+    if args.sheets:
+        for name in spreadsheet.sheet_names(file_path):
+            print(name)
+        return 0
+
+    for index, row in enumerate(spreadsheet.iter_rows(file_path, args.sheet)):
+        if index >= args.start + args.rows:
+            break
+        if index >= args.start:
+            print(f"Row {index}: {list(row[:args.columns] if args.columns else row)}")
+    return 0
+
+def cmd_seed(args):
+    from backend import seed_measures
+
+    seed_measures.seed_measures()
+    return 0
+
+def cmd_migrate(args):
+    from backend import migrate_to_postgres
+
+    migrate_to_postgres.migrate()
+    return 0
+
+# Run in a fresh interpreter so nothing this process imported skews the numbers
+STARTUP_PROBE = """
+import sys, time
+start = time.perf_counter()
+import backend.app.main
+elapsed = time.perf_counter() - start
+try:
+    import resource
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss // 1024
+except ImportError:
+    rss = -1
+heavy = [name for name in {heavy!r} if name in sys.modules]
+print(elapsed, rss, ",".join(heavy))
+"""
+
+def cmd_benchmark(args):
+    import statistics
+    import tracemalloc
+
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    timings = []
+    for _ in range(args.repeat):
+        output = subprocess.run(
+            [sys.executable, "-c", STARTUP_PROBE.format(heavy=HEAVY_MODULES)],
+            cwd=root, capture_output=True, text=True, check=True,
+        ).stdout.split()
+        timings.append(float(output[0]))
+        rss, heavy = int(output[1]), output[2] if len(output) > 2 else ""
+
+    print(f"API import: median {statistics.median(timings) * 1000:.0f} ms, min {min(timings) * 1000:.0f} ms over {args.repeat} runs")
+    if rss >= 0:
+        print(f"API peak RSS: {rss} MB")
+    print(f"Heavy modules loaded by the API: {heavy or 'none'}")
+
+    file_path = args.file or default_file()
+    if not os.path.exists(file_path):
+        print(f"File not found, skipping reader benchmark: {file_path}")
+        return 0
+
+    from backend import spreadsheet
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    rows = sum(1 for _ in spreadsheet.iter_rows(file_path, args.sheet))
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"Read {rows} rows from {os.path.basename(file_path)} in {elapsed * 1000:.0f} ms, peak {peak / 1024:.0f} KB allocated")
+    return 0
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m backend.cli", description="DietCalc maintenance tools")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    parser_import = subparsers.add_parser("import", help="Replace the catalog with the TACO spreadsheet (.ods/.xlsx)")
+    parser_import.add_argument("file", nargs="?", help="Spreadsheet path (default: TACO_FILE or the one in the repository)")
+    parser_import.add_argument("--sheet", help="Sheet name (default: the first)")
+    parser_import.set_defaults(func=cmd_import)
+
+    parser_inspect = subparsers.add_parser("inspect", help="Print sheet names or the first rows of a spreadsheet")
+    parser_inspect.add_argument("file", nargs="?")
+    parser_inspect.add_argument("--sheet")
+    parser_inspect.add_argument("--sheets", action="store_true", help="List the sheet names only")
+    parser_inspect.add_argument("--rows", type=int, default=10)
+    parser_inspect.add_argument("--start", type=int, default=0, help="First row to print (0-based)")
+    parser_inspect.add_argument("--columns", type=int, help="Only print the first N columns")
+    parser_inspect.set_defaults(func=cmd_inspect)
+
+    parser_seed = subparsers.add_parser("seed", help="Add common household measures to matching foods")
+    parser_seed.set_defaults(func=cmd_seed)
+
+    parser_migrate = subparsers.add_parser("migrate", help="Copy the SQLite catalog to the DATABASE_URL Postgres")
+    parser_migrate.set_defaults(func=cmd_migrate)
+
+    parser_benchmark = subparsers.add_parser("benchmark", help="Measure API import time/memory and spreadsheet read speed")
+    parser_benchmark.add_argument("file", nargs="?")
+    parser_benchmark.add_argument("--sheet")
+    parser_benchmark.add_argument("--repeat", type=int, default=5)
+    parser_benchmark.set_defaults(func=cmd_benchmark)
+
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+if __name__ == "__main__":
+    sys.exit(main())
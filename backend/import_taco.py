@@ -1,16 +1,18 @@
-import pandas as pd
 import sys
 import os
-import numpy as np
 
 # Add the parent directory to sys.path to allow importing app
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from sqlalchemy import select
+
 from backend.app.database import SessionLocal, engine, Base
-from backend.app.models import Food, Category
+from backend.app.models import Food, Category, MealItem, Recipe, RecipeIngredient
+from backend.app import search, catalog, recipes
+from backend import spreadsheet
 
 def clean_value(val):
-    if pd.isna(val):
+    if val is None:
         return None
     if isinstance(val, str):
         val = val.strip()
@@ -24,24 +26,31 @@ def clean_value(val):
             return None
     return float(val)
 
-def import_data():
-    print("Dropping old tables...")
-    Base.metadata.drop_all(bind=engine)
-    print("Creating tables...")
-    Base.metadata.create_all(bind=engine)
-    
-    file_path = r"c:\Users\paulo.santos\Documents\trae_projects\DietCalc\Tabela TACO Alimentos Excel.xlsx"
-    if not os.path.exists(file_path):
-        print("File not found!")
-        return
+# The spreadsheet shipped at the repository root (.ods or .xlsx both work)
+DEFAULT_FILE_PATH = os.getenv(
+    "TACO_FILE",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Tabela TACO Alimentos.ods"),
+)
 
-    print("Reading Excel...")
-    # Read from row 3 onwards (0-indexed, so header=None, skiprows=...)
-    # Actually, header=None reads all. We know the structure.
-    df = pd.read_excel(file_path, engine='openpyxl', header=None)
-    
-    session = SessionLocal()
-    
+# Spreadsheet columns 2-27, in order
+NUTRIENT_COLUMNS = (
+    "humidity", "energy_kcal", "energy_kj", "protein", "lipid", "cholesterol",
+    "carbohydrate", "fiber", "ash", "calcium", "magnesium", "manganese",
+    "phosphorus", "iron", "sodium", "potassium", "copper", "zinc",
+    "retinol", "re", "rae", "thiamin", "riboflavin", "pyridoxine", "niacin",
+    "vitamin_c",
+)
+
+def read_foods(file_path, sheet=None, progress=None):
+    """Parse the spreadsheet into a list of (category name, food fields).
+
+    Progress (and, for jobs, cancellation) is only reported here, before
+    anything is written.
+    """
+    # Cheap first pass (streamed, nothing kept) to give progress a total
+    total_rows = sum(1 for _ in spreadsheet.iter_rows(file_path, sheet))
+
+    foods = []
     current_category = None
     
     # Column mapping based on index
@@ -50,12 +59,17 @@ def import_data():
     # 20: Retinol, 21: RE, 22: RAE, 23: Thiamin, 24: Riboflavin, 25: Pyridoxine, 26: Niacin, 27: VitC
     
     print("Processing rows...")
-    count = 0
     
-    for index, row in df.iterrows():
+    # Streamed row by row
+    for index, row in enumerate(spreadsheet.iter_rows(file_path, sheet)):
+        if progress and index % 50 == 0:
+            progress(index, total_rows)
+
         if index < 3: # Skip headers
             continue
             
+        # Trailing empty cells may be missing
+        row = tuple(row) + (None,) * (28 - len(row))
         col0 = row[0]
         col1 = row[1]
         
@@ -64,9 +78,9 @@ def import_data():
         # OR Col 0 is text and doesn't look like an ID number
         
         is_category = False
-        if pd.notna(col0) and pd.isna(col1):
+        if col0 is not None and col1 is None:
             is_category = True
-        elif pd.notna(col0) and isinstance(col0, str) and not col0.replace('.', '').isdigit():
+        elif col0 is not None and isinstance(col0, str) and not col0.replace('.', '').isdigit():
              # Some categories might have non-NaN col1? Usually not in TACO.
              # Let's stick to: Col 1 is NaN is the safest bet for Category headers in this file structure
              pass
@@ -78,66 +92,101 @@ def import_data():
                 continue
                 
             print(f"Found Category: {cat_name}")
-            category = session.query(Category).filter(Category.name == cat_name).first()
-            if not category:
-                category = Category(name=cat_name)
-                session.add(category)
-                session.commit()
-                session.refresh(category)
-            current_category = category
+            current_category = cat_name
         else:
             # It's a food item
-            if pd.isna(col1): # Skip empty rows
+            if col1 is None: # Skip empty rows
                 continue
-                
-            food_name = str(col1).strip()
-            
-            # Parse values
-            vals = []
-            for i in range(2, 28):
-                vals.append(clean_value(row[i]))
-            
-            # Ensure we have a category (should have found one by now)
-            if not current_category:
-                # Fallback or skip?
-                # Maybe create a "General" category
-                pass
-
-            food = Food(
-                name=food_name,
-                category_id=current_category.id if current_category else None,
-                humidity=vals[0],
-                energy_kcal=vals[1],
-                energy_kj=vals[2],
-                protein=vals[3],
-                lipid=vals[4],
-                cholesterol=vals[5],
-                carbohydrate=vals[6],
-                fiber=vals[7],
-                ash=vals[8],
-                calcium=vals[9],
-                magnesium=vals[10],
-                manganese=vals[11],
-                phosphorus=vals[12],
-                iron=vals[13],
-                sodium=vals[14],
-                potassium=vals[15],
-                copper=vals[16],
-                zinc=vals[17],
-                retinol=vals[18],
-                re=vals[19],
-                rae=vals[20],
-                thiamin=vals[21],
-                riboflavin=vals[22],
-                pyridoxine=vals[23],
-                niacin=vals[24],
-                vitamin_c=vals[25]
-            )
+            if str(col1).strip() == "Descrição dos alimentos": # and header repetitions
+                continue
+
+            fields = {"name": str(col1).strip()}
+            for column, value in zip(NUTRIENT_COLUMNS, row[2:28]):
+                fields[column] = clean_value(value)
+            foods.append((current_category, fields))
+
+    return foods
+
+def replace_catalog(session, foods):
+    """Make the catalog match `foods` inside the session's transaction.
+
+    Foods and categories are matched by name and updated in place, so their
+    ids (and the meal items, recipe ingredients and household measures that
+    point at them) survive a re-import. Foods no longer in the spreadsheet
+    are deleted unless something still references them. Recipe foods are
+    left alone and their profiles recomputed. The caller commits.
+    """
+    categories = {category.name: category for category in session.query(Category)}
+    recipe_foods = select(Recipe.food_id).where(Recipe.food_id.is_not(None))
+    existing = {food.name: food for food in session.query(Food).filter(Food.id.not_in(recipe_foods))}
+
+    imported = set()
+    for category_name, fields in foods:
+        category = None
+        if category_name is not None:
+            category = categories.get(category_name)
+            if category is None:
+                category = categories[category_name] = Category(name=category_name)
+                session.add(category)
+
+        food = existing.get(fields["name"])
+        if food is None:
+            food = existing[fields["name"]] = Food()
             session.add(food)
-            count += 1
-            
-    session.commit()
+        food.category = category
+        for column, value in fields.items():
+            setattr(food, column, value)
+        imported.add(food)
+    session.flush()
+
+    referenced = {
+        food_id
+        for model in (MealItem, RecipeIngredient)
+        for (food_id,) in session.query(model.food_id).distinct()
+    }
+    for food in existing.values():
+        if food in imported or food.id in referenced:
+            continue
+        for measure in food.household_measures:
+            session.delete(measure)
+        session.delete(food)
+    session.flush()
+
+    used = {category_id for (category_id,) in session.query(Food.category_id).distinct()}
+    for category in categories.values():
+        if category.id not in used:
+            session.delete(category)
+
+    # Recipes are stored as foods too; their ingredients may have changed
+    recipes.refresh_all(session)
+    session.flush()
+    return len(imported)
+
+def import_data(file_path=DEFAULT_FILE_PATH, progress=None, sheet=None):
+    # Check the file before touching anything
+    if not os.path.exists(file_path):
+        print("File not found!")
+        return
+
+    foods = read_foods(file_path, sheet, progress)
+
+    # First run (e.g. the CLI before the API ever started)
+    Base.metadata.create_all(bind=engine)
+    search.setup(engine)
+
+    # Only the catalog is replaced; meals, profiles, recipes, intake history
+    # and jobs are kept. Everything, including the reset entry that tells
+    # clients to resync, commits in one transaction: a failure leaves the
+    # old catalog untouched.
+    print("Replacing catalog...")
+    session = SessionLocal()
+    try:
+        count = replace_catalog(session, foods)
+        catalog.record_reset(session)
+    finally:
+        session.close()
     print(f"Imported {count} foods successfully.")
+    return {"foods": count}
 
 if __name__ == "__main__":
     import_data()
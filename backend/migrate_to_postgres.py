@@ -12,7 +12,7 @@ from backend.app import models
 
 load_dotenv()
 
-def migrate():
+def migrate(progress=None):
     # 1. Connect to SQLite (Source)
     sqlite_url = "sqlite:///./backend/data/dietcalc.db"
     sqlite_engine = create_engine(sqlite_url)
@@ -46,6 +46,8 @@ def migrate():
         pg_session.commit()
         
         # Foods
+        if progress:
+            progress(1, 3)
         print("Migrating Foods...")
         foods = sqlite_session.query(models.Food).all()
         for food in foods:
@@ -72,6 +74,8 @@ def migrate():
         # Let's stick to simple loop for MVP size data (600 items is small).
         
         # Household Measures
+        if progress:
+            progress(2, 3)
         print("Migrating Household Measures...")
         measures = sqlite_session.query(models.HouseholdMeasure).all()
         for m in measures:
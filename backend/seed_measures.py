@@ -7,8 +7,9 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from backend.app.database import SessionLocal, engine
 from backend.app import models
+from backend.app import catalog  # noqa: F401 (logs new measures for catalog sync)
 
-def seed_measures():
+def seed_measures(progress=None):
     session = SessionLocal()
     print("Seeding household measures...")
     
@@ -35,7 +36,10 @@ def seed_measures():
     # Iterate over all foods and check if they match keywords
     foods = session.query(models.Food).all()
     
-    for food in foods:
+    for index, food in enumerate(foods):
+        if progress:
+            progress(index, len(foods))
+
         # Skip if already has measures (to prevent dupes if run multiple times)
         if session.query(models.HouseholdMeasure).filter(models.HouseholdMeasure.food_id == food.id).count() > 0:
             continue
@@ -55,7 +59,9 @@ def seed_measures():
                 # For MVP, simplistic matching is fine.
                 
     session.commit()
+    session.close()
     print(f"Added {count} household measures.")
+    return {"measures": count}
 
 if __name__ == "__main__":
     seed_measures()
@@ -0,0 +1,129 @@
+import argparse
+import gc
+import os
+import sys
+
+# Add the parent directory to sys.path to allow importing app
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+APP_PATH = "backend.app.main:app"
+
+def preload():
+    # Runs once in the master before forking: everything imported and built
+    # here is shared copy-on-write by the workers.
+    from sqlalchemy.orm import configure_mappers
+    from backend.app.main import app
+    from backend.app.database import SessionLocal, engine
+    from backend.app import catalog
+
+    configure_mappers()
+    app.openapi()
+
+    # Build the catalog snapshot (kept in catalog._snapshot) here so the
+    # workers inherit it instead of each building its own; it also warms the
+    # statement cache and the DB file pages
+    db = SessionLocal()
+    try:
+        catalog.snapshot(db)
+    finally:
+        db.close()
+
+    # Connections must not cross a fork; each worker opens its own
+    engine.dispose()
+
+    # Move preloaded objects out of the GC generations so collections in the
+    # workers don't touch (and copy) their pages
+    gc.freeze()
+    return app
+
+def warm_pool(connections):
+    from sqlalchemy import text
+    from backend.app.database import engine
+
+    opened = []
+    try:
+        for _ in range(connections):
+            conn = engine.connect()
+            conn.execute(text("SELECT 1"))
+            opened.append(conn)
+    finally:
+        for conn in opened:
+            conn.close()
+
+def worker_class():
+    try:
+        import uvicorn_worker
+        base = uvicorn_worker.UvicornWorker
+    except ImportError:
+        from uvicorn.workers import UvicornWorker as base
+
+    config = {"lifespan": "on"}
+    try:
+        import uvloop  # noqa: F401
+        config["loop"] = "uvloop"
+    except ImportError:
+        pass
+    try:
+        import httptools  # noqa: F401
+        config["http"] = "httptools"
+    except ImportError:
+        pass
+
+    return type("DietCalcWorker", (base,), {"CONFIG_KWARGS": {**base.CONFIG_KWARGS, **config}})
+
+def run_gunicorn(args):
+    from gunicorn.app.base import BaseApplication
+
+    class Application(BaseApplication):
+        def load_config(self):
+            self.cfg.set("bind", f"{args.host}:{args.port}")
+            self.cfg.set("workers", args.workers)
+            self.cfg.set("worker_class", worker_class())
+            self.cfg.set("preload_app", True)
+            self.cfg.set("graceful_timeout", args.graceful_timeout)
+            self.cfg.set("keepalive", 5)
+            # Recycle workers periodically; jitter keeps them from restarting together
+            self.cfg.set("max_requests", args.max_requests)
+            self.cfg.set("max_requests_jitter", args.max_requests // 10)
+            self.cfg.set("post_fork", lambda server, worker: warm_pool(args.pool_warm))
+
+        def load(self):
+            return preload()
+
+    Application().run()
+
+def run_uvicorn(args):
+    # No fork/preload on platforms without gunicorn (e.g. Windows): each
+    # worker process imports the app on its own.
+    import uvicorn
+
+    uvicorn.run(APP_PATH, host=args.host, port=args.port, workers=args.workers, lifespan="on")
+
+def main():
+    parser = argparse.ArgumentParser(description="DietCalc production server")
+    parser.add_argument("--host", default=os.getenv("HOST", "0.0.0.0"))
+    parser.add_argument("--port", type=int, default=int(os.getenv("PORT", "8000")))
+    parser.add_argument("--workers", type=int, default=int(os.getenv("WEB_CONCURRENCY") or os.cpu_count() or 1))
+    parser.add_argument("--graceful-timeout", type=int, default=30)
+    parser.add_argument("--max-requests", type=int, default=10000)
+    parser.add_argument("--pool-warm", type=int, default=2, help="DB connections opened per worker at start")
+    args = parser.parse_args()
+
+    # Every worker gets its own jobs pool (backend.app.jobs); unless .env or
+    # the environment sets JOB_WORKERS, split the cores between them instead
+    # of starting workers x cores job processes
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    if not os.getenv("JOB_WORKERS"):
+        os.environ["JOB_WORKERS"] = str(max(1, (os.cpu_count() or 1) // args.workers))
+
+    try:
+        import gunicorn  # noqa: F401
+    except ImportError:
+        run_uvicorn(args)
+    else:
+        run_gunicorn(args)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+import os
+import zipfile
+import xml.etree.ElementTree as ET
+
+# Row-by-row spreadsheet reading for the import tooling. Nothing here loads
+# a whole sheet: .ods content.xml is parsed incrementally with the standard
+# library, and .xlsx goes through openpyxl's read-only (streaming) mode.
+
+_TABLE = "{urn:oasis:names:tc:opendocument:xmlns:table:1.0}"
+_OFFICE = "{urn:oasis:names:tc:opendocument:xmlns:office:1.0}"
+
+def _ods_value(cell):
+    value_type = cell.get(_OFFICE + "value-type")
+    if value_type is None:
+        return None
+    if value_type in ("float", "percentage", "currency"):
+        return float(cell.get(_OFFICE + "value"))
+    if value_type == "boolean":
+        return cell.get(_OFFICE + "boolean-value") == "true"
+    if value_type == "date":
+        return cell.get(_OFFICE + "date-value")
+    if value_type == "time":
+        return cell.get(_OFFICE + "time-value")
+    return "\n".join("".join(p.itertext()) for p in cell if p.tag.endswith("}p"))
+
+def _ods_row(element):
+    values = []
+    blank = 0
+    for cell in element:
+        if cell.tag not in (_TABLE + "table-cell", _TABLE + "covered-table-cell"):
+            continue
+        repeat = int(cell.get(_TABLE + "number-columns-repeated", "1"))
+        value = _ods_value(cell)
+        if value is None:
+            # Only expanded if a value follows, so trailing runs cost nothing
+            blank += repeat
+            continue
+        values.extend([None] * blank)
+        blank = 0
+        values.extend([value] * repeat)
+    return tuple(values)
+
+def _ods_tables(file_path):
+    """Yield (sheet name, row iterator) per table, in document order.
+
+    Each row iterator must be exhausted before moving on to the next table.
+    """
+    with zipfile.ZipFile(file_path) as archive, archive.open("content.xml") as content:
+        events = ET.iterparse(content, events=("start", "end"))
+        parents = []
+        for event, element in events:
+            if event == "end":
+                parents.pop()
+                continue
+            parents.append(element)
+            if element.tag == _TABLE + "table":
+                yield element.get(_TABLE + "name"), _ods_rows(events, parents)
+
+def _ods_rows(events, parents):
+    # Consumes the shared event stream up to the end of the current table,
+    # dropping each row from the tree once parsed to keep memory flat
+    depth = len(parents)
+    empty = 0
+    for event, element in events:
+        if event == "start":
+            parents.append(element)
+            continue
+        parents.pop()
+        if len(parents) < depth:
+            # End of the table
+            parents[-1].remove(element)
+            return
+        if element.tag != _TABLE + "table-row":
+            continue
+        row = _ods_row(element)
+        repeat = int(element.get(_TABLE + "number-rows-repeated", "1"))
+        parents[-1].remove(element)
+        if not row:
+            # Only emitted if a non-empty row follows
+            empty += repeat
+            continue
+        for _ in range(empty):
+            yield ()
+        empty = 0
+        for _ in range(repeat):
+            yield row
+
+def _is_ods(file_path):
+    return os.path.splitext(file_path)[1].lower() == ".ods"
+
+def sheet_names(file_path):
+    if _is_ods(file_path):
+        names = []
+        for name, rows in _ods_tables(file_path):
+            names.append(name)
+            for _ in rows:
+                pass
+        return names
+
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(file_path, read_only=True)
+    try:
+        return workbook.sheetnames
+    finally:
+        workbook.close()
+
+def iter_rows(file_path, sheet=None):
+    """Yield each row of `sheet` (default: the first) as a tuple of cell values.
+
+    Empty cells are None; trailing empty cells may be missing from the tuple.
+    """
+    if _is_ods(file_path):
+        for name, rows in _ods_tables(file_path):
+            if sheet is None or name == sheet:
+                yield from rows
+                return
+            for _ in rows:
+                pass
+        raise KeyError(f"Sheet not found: {sheet}")
+
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        worksheet = workbook[sheet] if sheet else workbook.worksheets[0]
+        for row in worksheet.iter_rows(values_only=True):
+            yield row
+    finally:
+        workbook.close()
@@ -0,0 +1,24 @@
+import pytest
+from fastapi.testclient import TestClient
+from backend.app.main import app
+
+client = TestClient(app)
+
+@pytest.fixture
+def create_food():
+    """POST a food to the catalog and return its id."""
+    def create(name="Test Food", energy_kcal=100, protein=1, carbohydrate=1, lipid=1):
+        response = client.post(
+            "/foods/",
+            json={
+                "name": name,
+                "description": "Test",
+                "energy_kcal": energy_kcal,
+                "protein": protein,
+                "carbohydrate": carbohydrate,
+                "lipid": lipid
+            }
+        )
+        assert response.status_code == 200
+        return response.json()["id"]
+    return create
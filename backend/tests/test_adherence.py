@@ -0,0 +1,75 @@
+from fastapi.testclient import TestClient
+from backend.app.main import app
+
+client = TestClient(app)
+
+PROFILE = {
+    "name": "Adherence User",
+    "age": 30,
+    "weight": 80,
+    "height": 180,
+    "sex": "M",
+    "activity_level": "moderately_active",
+}
+
+def test_profile_goals_derived_on_server():
+    profile = client.post("/profile/", json=PROFILE).json()
+    calculated = client.post("/nutrition/calculate", json=PROFILE).json()
+
+    assert profile["goal_tmb"] == calculated["tmb"] == 1780
+    assert profile["goal_get"] == calculated["get"]
+    assert profile["goal_protein_g"] == calculated["macros"]["protein"]["max_grams"]
+    assert profile["goal_fat_g"] == calculated["macros"]["lipid"]["max_grams"]
+    # Client-sent goals are ignored
+    ignored = client.post("/profile/", json={**PROFILE, "goal_get": 1}).json()
+    assert ignored["goal_get"] == profile["goal_get"]
+    assert ignored["goals_version"] == profile["goals_version"]
+
+    heavier = client.post("/profile/", json={**PROFILE, "weight": 90}).json()
+    assert heavier["goal_tmb"] == 1880
+    assert heavier["goals_version"] == profile["goals_version"] + 1
+    assert client.get("/profile/").json() == heavier
+
+def test_adherence_from_daily_totals():
+    profile = client.post("/profile/", json=PROFILE).json()
+    # 200 g of this food is half of every macro goal
+    food = client.post(
+        "/foods/",
+        json={
+            "name": "Adherence Food",
+            "description": "Test",
+            "energy_kcal": profile["goal_get"] / 4,
+            "protein": profile["goal_protein_g"] / 4,
+            "carbohydrate": profile["goal_carbs_g"] / 4,
+            "lipid": profile["goal_fat_g"] / 4,
+        }
+    ).json()
+    meal = client.post("/meals/", json={
+        "name": "Adherence Day",
+        "consumed_at": "1993-02-02T12:00:00",
+        "items": [{"food_id": food["id"], "quantity": 200}]
+    }).json()
+
+    try:
+        data = client.get("/profile/adherence", params={"day": "1993-02-02"}).json()
+        macros = {macro["nutrient"]: macro for macro in data["macros"]}
+        # Half of every goal
+        assert macros["energy_kcal"]["intake"] == round(profile["goal_get"] / 2, 2)
+        assert macros["protein"]["deviation"] == -0.5
+        assert data["score"] == 50
+        # The food has no micronutrients
+        assert "calcium" in [deficit["nutrient"] for deficit in data["deficits"]]
+    finally:
+        client.delete(f"/meals/{meal['id']}")
+
+    data = client.get("/profile/adherence", params={"day": "1993-02-02"}).json()
+    assert data["score"] == 0
+
+def test_adherence_follows_goal_changes():
+    profile = client.post("/profile/", json=PROFILE).json()
+    before = client.get("/profile/adherence", params={"day": "1993-02-03"}).json()
+    assert {macro["nutrient"]: macro["goal"] for macro in before["macros"]}["energy_kcal"] == profile["goal_get"]
+
+    lighter = client.post("/profile/", json={**PROFILE, "weight": 70}).json()
+    after = client.get("/profile/adherence", params={"day": "1993-02-03"}).json()
+    assert {macro["nutrient"]: macro["goal"] for macro in after["macros"]}["energy_kcal"] == lighter["goal_get"]
@@ -0,0 +1,93 @@
+import time
+import pytest
+from fastapi.testclient import TestClient
+from backend.app.main import app
+from backend.app import cache
+
+client = TestClient(app)
+
+def test_memory_cache_lru_eviction():
+    backend = cache.MemoryCache(max_entries=2)
+    backend.set("a", 1)
+    backend.set("b", 2)
+    backend.get("a")
+    backend.set("c", 3)
+
+    assert backend.get("b") is cache._MISSING
+    assert backend.get("a") == 1
+    assert backend.stats()["evictions"] == 1
+
+def test_memory_cache_ttl():
+    backend = cache.MemoryCache(ttl=0.01)
+    backend.set("a", 1)
+    time.sleep(0.02)
+    assert backend.get("a") is cache._MISSING
+
+def test_memory_cache_invalidate_by_tag():
+    backend = cache.MemoryCache()
+    backend.set("a", 1, tags=["food:1"])
+    backend.set("b", 2, tags=["food:2"])
+    backend.invalidate(["food:1"])
+
+    assert backend.get("a") is cache._MISSING
+    assert backend.get("b") == 2
+
+def test_stale_set_is_dropped():
+    backend = cache.MemoryCache()
+    generation = backend.generation()
+    backend.invalidate(["food:1"])
+    backend.set("a", 1, tags=["food:1"], generation=generation)
+    assert backend.get("a") is cache._MISSING
+
+def test_redis_cache_invalidate_by_tag():
+    fakeredis = pytest.importorskip("fakeredis")
+    backend = cache.RedisCache(fakeredis.FakeRedis())
+    backend.set("a", {"x": 1}, tags=["meal:1"])
+    assert backend.get("a") == {"x": 1}
+
+    backend.invalidate(["meal:1"])
+    assert backend.get("a") is cache._MISSING
+    assert backend.stats()["invalidations"] == 1
+
+def test_measures_invalidated_on_commit(create_food):
+    food_id = create_food("Cache Test Food")
+
+    assert client.get(f"/measures/{food_id}").json() == []
+    hits = cache.backend.stats()["hits"]
+    assert client.get(f"/measures/{food_id}").json() == []
+    assert cache.backend.stats()["hits"] == hits + 1
+
+    client.post("/measures/", json={"food_id": food_id, "unit_name": "Fatia", "quantity_g": 25})
+    measures = client.get(f"/measures/{food_id}").json()
+    assert [m["unit_name"] for m in measures] == ["Fatia"]
+
+def test_meal_totals_follow_meal_changes_not_food_edits(create_food):
+    food_id = create_food("Cache Totals Food", 200, 10)
+    meal = client.post("/meals/", json={"name": "Cache Meal", "items": [{"food_id": food_id, "quantity": 50}]}).json()
+
+    totals = client.get(f"/meals/{meal['id']}/totals").json()
+    assert totals["quantity"] == 50
+    assert totals["nutrients"]["energy_kcal"] == 100
+
+    # Items keep the nutrients they were added with
+    client.put(f"/foods/{food_id}", json={"energy_kcal": 400})
+    totals = client.get(f"/meals/{meal['id']}/totals").json()
+    assert totals["nutrients"]["energy_kcal"] == 100
+
+    client.post(f"/meals/{meal['id']}/items", json={"food_id": food_id, "quantity": 50})
+    totals = client.get(f"/meals/{meal['id']}/totals").json()
+    assert totals["quantity"] == 100
+    assert totals["nutrients"]["energy_kcal"] == 300
+
+def test_cache_stats():
+    response = client.get("/cache/stats")
+    assert response.status_code == 200
+    assert {"hits", "misses", "evictions"} <= set(response.json())
+
+def test_redis_clear_drops_stale_set():
+    fakeredis = pytest.importorskip("fakeredis")
+    backend = cache.RedisCache(fakeredis.FakeRedis())
+    generation = backend.generation()
+    backend.clear()
+    backend.set("a", 1, generation=generation)
+    assert backend.get("a") is cache._MISSING
@@ -0,0 +1,42 @@
+from fastapi.testclient import TestClient
+from backend.app.main import app
+
+client = TestClient(app)
+
+def test_snapshot_is_versioned(create_food):
+    food_id = create_food("Catalog Snapshot Food")
+    response = client.get("/catalog/snapshot")
+    assert response.status_code == 200
+    data = response.json()
+    assert food_id in [food["id"] for food in data["foods"]]
+    assert "categories" in data and "measures" in data
+    assert response.headers["etag"] == f'"{data["version"]}"'
+
+    response = client.get("/catalog/snapshot", headers={"If-None-Match": f'"{data["version"]}"'})
+    assert response.status_code == 304
+
+def test_snapshot_gzip():
+    response = client.get("/catalog/snapshot", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+
+def test_changes_since_version(create_food):
+    version = client.get("/catalog/changes", params={"since": 0}).json()["version"]
+
+    food_id = create_food("Catalog Delta Food")
+    client.post("/measures/", json={"food_id": food_id, "unit_name": "Fatia", "quantity_g": 25})
+    deleted_id = create_food("Catalog Deleted Food")
+    client.delete(f"/foods/{deleted_id}")
+
+    data = client.get("/catalog/changes", params={"since": version}).json()
+    assert data["version"] > version
+    assert not data["reset"]
+    assert [food["id"] for food in data["foods"]] == [food_id]
+    assert [measure["food_id"] for measure in data["measures"]] == [food_id]
+    assert data["deleted"]["foods"] == [deleted_id]
+
+    data = client.get("/catalog/changes", params={"since": data["version"]}).json()
+    assert data["foods"] == [] and data["deleted"]["foods"] == []
+
+def test_changes_from_unknown_version_reset():
+    data = client.get("/catalog/changes", params={"since": 10 ** 9}).json()
+    assert data["reset"]
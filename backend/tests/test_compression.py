@@ -0,0 +1,44 @@
+import msgpack
+import pytest
+from fastapi.testclient import TestClient
+from backend.app.main import app
+
+client = TestClient(app)
+
+@pytest.fixture
+def meal(create_food):
+    food_id = create_food("Compression Food")
+    items = [{"food_id": food_id, "quantity": 10 + i} for i in range(30)]
+    return client.post("/meals/", json={"name": "Compression Meal", "items": items}).json()
+
+def test_gzip_large_response(meal):
+    response = client.get(f"/meals/{meal['id']}", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert "Accept-Encoding" in response.headers["vary"]
+    # httpx decodes transparently
+    assert len(response.json()["items"]) == 30
+
+def test_brotli_preferred_by_quality(meal):
+    pytest.importorskip("brotli")
+    response = client.get(f"/meals/{meal['id']}", headers={"Accept-Encoding": "gzip;q=0.5, br"})
+    assert response.headers["content-encoding"] == "br"
+
+def test_small_response_not_compressed():
+    response = client.get("/", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in response.headers
+
+def test_streaming_export_compressed(meal):
+    response = client.get("/meals/export", params={"format": "csv"}, headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.text.startswith("meal_id,")
+
+def test_msgpack_response(meal):
+    response = client.get(f"/meals/{meal['id']}", headers={"Accept": "application/msgpack"})
+    assert response.headers["content-type"] == "application/msgpack"
+    data = msgpack.unpackb(response.content)
+    assert data["id"] == meal["id"]
+    assert len(data["items"]) == 30
+
+def test_json_by_default():
+    response = client.get("/foods/categories")
+    assert response.headers["content-type"] == "application/json"
@@ -0,0 +1,92 @@
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from fastapi.testclient import TestClient
+from backend.app.main import app
+from backend.app.database import WriterQueue
+
+client = TestClient(app)
+
+THREADS = 16
+REQUESTS = 96
+# Generous bound: catches requests stuck behind the lock, not slow hosts
+MAX_LATENCY = 10.0
+
+def hammer(call, count=REQUESTS):
+    def timed(index):
+        start = time.perf_counter()
+        response = call(index)
+        return response, time.perf_counter() - start
+
+    with ThreadPoolExecutor(max_workers=THREADS) as pool:
+        return list(pool.map(timed, range(count)))
+
+def test_concurrent_meal_creation():
+    run = uuid.uuid4().hex[:8]
+    results = hammer(lambda i: client.post("/meals/", json={"name": f"Load {run} {i}"}))
+
+    assert [response.status_code for response, _ in results] == [200] * REQUESTS
+    assert max(latency for _, latency in results) < MAX_LATENCY
+
+    ids = {response.json()["id"] for response, _ in results}
+    assert len(ids) == REQUESTS
+    names = {meal["name"] for meal in client.get("/meals/", params={"limit": 100000}).json()}
+    assert {f"Load {run} {i}" for i in range(REQUESTS)} <= names
+
+def test_concurrent_items_on_one_meal():
+    meal = client.post("/meals/", json={"name": "Load Items"}).json()
+    results = hammer(lambda i: client.post(f"/meals/{meal['id']}/items", json={"food_id": 1, "quantity": 10}))
+
+    assert [response.status_code for response, _ in results] == [200] * REQUESTS
+    assert max(latency for _, latency in results) < MAX_LATENCY
+
+    # No lost writes: every item made it into the meal and its totals
+    assert len(client.get(f"/meals/{meal['id']}").json()["items"]) == REQUESTS
+    totals = client.get(f"/meals/{meal['id']}/totals").json()
+    assert abs(totals["quantity"] - 10 * REQUESTS) < 1e-6
+
+def test_concurrent_food_writes():
+    run = uuid.uuid4().hex[:8]
+
+    def create(i):
+        return client.post("/foods/", json={
+            "name": f"Load Food {run} {i}",
+            "description": "Test",
+            "energy_kcal": i,
+            "protein": 1,
+            "carbohydrate": 1,
+            "lipid": 1,
+        })
+
+    created = hammer(create, REQUESTS // 2)
+    assert [response.status_code for response, _ in created] == [200] * (REQUESTS // 2)
+
+    ids = [response.json()["id"] for response, _ in created]
+    deleted = hammer(lambda i: client.delete(f"/foods/{ids[i]}"), len(ids))
+    assert [response.status_code for response, _ in deleted] == [200] * len(ids)
+    assert max(latency for _, latency in created + deleted) < MAX_LATENCY
+
+    for food_id in ids:
+        assert client.get(f"/foods/{food_id}").status_code == 404
+
+def test_writer_queue_is_fifo_and_reentrant():
+    queue = WriterQueue()
+    order = []
+
+    queue.acquire()
+    queue.acquire()
+    queue.release()
+
+    def worker(index):
+        queue.acquire()
+        order.append(index)
+        queue.release()
+
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        future = pool.submit(worker, 0)
+        time.sleep(0.05)
+        # Still held by the outer acquire
+        assert order == []
+        queue.release()
+        future.result(timeout=5)
+    assert order == [0]
@@ -0,0 +1,61 @@
+import json
+import uuid
+from fastapi.testclient import TestClient
+from backend.app.main import app
+from backend.app.models import NUTRIENT_COLUMNS
+
+client = TestClient(app)
+
+def test_read_food_exposes_all_nutrients(create_food):
+    food_id = create_food("Export Test Food")
+    response = client.get(f"/foods/{food_id}")
+    assert response.status_code == 200
+    data = response.json()
+    for column in NUTRIENT_COLUMNS:
+        assert column in data
+
+def test_export_foods_csv(create_food):
+    create_food("Export Test Food")
+    response = client.get("/foods/export", params={"format": "csv"})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    header = response.text.splitlines()[0].split(",")
+    assert header[:2] == ["id", "name"]
+    assert set(NUTRIENT_COLUMNS) <= set(header)
+
+def test_export_foods_ndjson_filtered(create_food):
+    food_id = create_food("Export Ndjson Food")
+    response = client.get("/foods/export", params={"format": "ndjson", "search": "Export Ndjson"})
+    assert response.status_code == 200
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert food_id in [row["id"] for row in rows]
+    assert all("Export Ndjson" in row["name"] for row in rows)
+
+def test_export_search_matches_list_search(create_food):
+    run = uuid.uuid4().hex[:8]
+    food_id = create_food(f"Feijão preto x{run}")
+    params = {"search": f"feijao x{run}"}
+    listed = [food["id"] for food in client.get("/foods/", params=params).json()]
+    response = client.get("/foods/export", params={"format": "ndjson", **params})
+    exported = [json.loads(line)["id"] for line in response.text.splitlines()]
+    assert food_id in listed
+    assert sorted(exported) == sorted(listed)
+
+def test_export_foods_invalid_format():
+    response = client.get("/foods/export", params={"format": "xml"})
+    assert response.status_code == 422
+
+def test_search_ignores_accents_and_matches_prefix(create_food):
+    food_id = create_food("Feijão carioca cozido searchtest")
+    for term in ["feijao searchtest", "FEIJ searcht", "carioca searchtest"]:
+        response = client.get("/foods/", params={"search": term})
+        assert response.status_code == 200
+        assert food_id in [food["id"] for food in response.json()]
+
+def test_search_follows_rename(create_food):
+    food_id = create_food("Renametest antes")
+    client.put(f"/foods/{food_id}", json={"name": "Renametest depois"})
+    ids = [food["id"] for food in client.get("/foods/", params={"search": "renametest depois"}).json()]
+    assert food_id in ids
+    ids = [food["id"] for food in client.get("/foods/", params={"search": "renametest antes"}).json()]
+    assert food_id not in ids
@@ -0,0 +1,80 @@
+import uuid
+from fastapi.testclient import TestClient
+from backend.app.main import app
+
+client = TestClient(app)
+
+def test_retry_replays_response():
+    key = str(uuid.uuid4())
+    first = client.post("/meals/", json={"name": "Idempotent Meal"}, headers={"Idempotency-Key": key})
+    second = client.post("/meals/", json={"name": "Idempotent Meal"}, headers={"Idempotency-Key": key})
+
+    assert first.status_code == second.status_code == 200
+    assert first.json() == second.json()
+    assert second.headers["idempotent-replayed"] == "true"
+
+def test_retry_does_not_duplicate_items():
+    meal = client.post("/meals/", json={"name": "Idempotent Items"}).json()
+    key = str(uuid.uuid4())
+    for _ in range(3):
+        client.post(f"/meals/{meal['id']}/items", json={"food_id": 1, "quantity": 100}, headers={"Idempotency-Key": key})
+
+    assert len(client.get(f"/meals/{meal['id']}").json()["items"]) == 1
+
+def test_same_key_different_body_rejected():
+    key = str(uuid.uuid4())
+    client.post("/meals/", json={"name": "First"}, headers={"Idempotency-Key": key})
+    response = client.post(
+        "/meals/",
+        json={"name": "Second"},
+        headers={"Idempotency-Key": key, "Origin": "http://localhost:5173"}
+    )
+    assert response.status_code == 422
+    # Browsers can read the error
+    assert "access-control-allow-origin" in response.headers
+
+def test_same_key_different_accept_rejected():
+    key = str(uuid.uuid4())
+    client.post("/meals/", json={"name": "Msgpack"}, headers={"Idempotency-Key": key, "Accept": "application/msgpack"})
+    response = client.post("/meals/", json={"name": "Msgpack"}, headers={"Idempotency-Key": key, "Accept": "application/json"})
+    assert response.status_code == 422
+
+def test_without_key_runs_every_time():
+    first = client.post("/meals/", json={"name": "No Key"}).json()
+    second = client.post("/meals/", json={"name": "No Key"}).json()
+    assert first["id"] != second["id"]
+
+def test_keys_are_scoped_to_path():
+    key = str(uuid.uuid4())
+    meal = client.post("/meals/", json={"name": "Scoped"}, headers={"Idempotency-Key": key}).json()
+    food = client.post(
+        "/foods/",
+        json={"name": "Scoped", "description": "Test", "energy_kcal": 1, "protein": 1, "carbohydrate": 1, "lipid": 1},
+        headers={"Idempotency-Key": key}
+    )
+    assert food.status_code == 200
+    assert "idempotent-replayed" not in food.headers
+    assert meal["name"] == "Scoped"
+
+def test_stale_claim_taken_over():
+    from datetime import datetime, timedelta
+    from backend.app import idempotency, models
+    from backend.app.database import SessionLocal
+
+    # Left behind by a process that died mid-request
+    client_key = str(uuid.uuid4())
+    db = SessionLocal()
+    try:
+        db.add(models.IdempotencyKey(
+            key=idempotency._digest("POST", "/meals/", client_key),
+            fingerprint="unknown",
+            expires_at=datetime.utcnow() - timedelta(seconds=1),
+        ))
+        db.commit()
+    finally:
+        db.close()
+
+    response = client.post("/meals/", json={"name": "Taken Over"}, headers={"Idempotency-Key": client_key})
+    assert response.status_code == 200
+    replay = client.post("/meals/", json={"name": "Taken Over"}, headers={"Idempotency-Key": client_key})
+    assert replay.headers["idempotent-replayed"] == "true"
@@ -0,0 +1,72 @@
+from fastapi.testclient import TestClient
+from backend.app.main import app
+
+client = TestClient(app)
+
+def summary(**params):
+    # {period: (grams, kcal)}; the test database persists between runs
+    response = client.get("/intake/summary", params=params)
+    assert response.status_code == 200
+    return {row["period"]: (row["quantity"], row["nutrients"]["energy_kcal"] or 0) for row in response.json()}
+
+def diff(before, after):
+    deltas = {
+        period: (grams - before.get(period, (0, 0))[0], kcal - before.get(period, (0, 0))[1])
+        for period, (grams, kcal) in after.items()
+    }
+    return {period: delta for period, delta in deltas.items() if delta != (0, 0)}
+
+def test_daily_weekly_monthly_summary(create_food):
+    food_id = create_food("Intake Food", 200, 10, 20, 5)
+    window = {"from": "1990-03-01", "to": "1990-03-31"}
+    before = {bucket: summary(bucket=bucket, **window) for bucket in ("day", "week", "month")}
+
+    client.post("/meals/", json={
+        "name": "Intake Breakfast",
+        "consumed_at": "1990-03-05T08:00:00",
+        "items": [{"food_id": food_id, "quantity": 100}]
+    })
+    client.post("/meals/", json={
+        "name": "Intake Lunch",
+        "consumed_at": "1990-03-07T12:00:00",
+        "items": [{"food_id": food_id, "quantity": 50}]
+    })
+
+    assert diff(before["day"], summary(bucket="day", **window)) == {
+        "1990-03-05": (100, 200),
+        "1990-03-07": (50, 100),
+    }
+    # Weeks start on Monday
+    assert diff(before["week"], summary(bucket="week", **window)) == {"1990-03-05": (150, 300)}
+    assert diff(before["month"], summary(bucket="month", **window)) == {"1990-03-01": (150, 300)}
+
+def test_removed_items_are_reversed(create_food):
+    food_id = create_food("Intake Food", 200, 10, 20, 5)
+    window = {"from": "1991-06-10", "to": "1991-06-10"}
+    before = summary(**window)
+
+    meal = client.post("/meals/", json={
+        "name": "Intake Dinner",
+        "consumed_at": "1991-06-10T20:00:00",
+        "items": [{"food_id": food_id, "quantity": 100}, {"food_id": food_id, "quantity": 100}]
+    }).json()
+
+    client.delete(f"/meals/{meal['id']}/items/{meal['items'][0]['id']}")
+    assert diff(before, summary(**window)) == {"1991-06-10": (100, 200)}
+
+    # Edits to the food don't change what was logged
+    client.put(f"/foods/{food_id}", json={"energy_kcal": 1000})
+    client.delete(f"/meals/{meal['id']}")
+    assert diff(before, summary(**window)) == {}
+
+def test_export_date_filter(create_food):
+    food_id = create_food("Intake Food", 200, 10, 20, 5)
+    meal = client.post("/meals/", json={
+        "name": "Intake Export",
+        "consumed_at": "1992-01-15T12:00:00",
+        "items": [{"food_id": food_id, "quantity": 100}]
+    }).json()
+    response = client.get("/meals/export", params={"format": "csv", "from": "1992-01-15", "to": "1992-01-15"})
+    rows = response.text.splitlines()[1:]
+    assert str(meal["id"]) in [row.split(",")[0] for row in rows]
+    assert all("1992-01-15" in row for row in rows)
@@ -0,0 +1,111 @@
+import time
+import socket
+import pytest
+from fastapi.testclient import TestClient
+from backend.app.main import app
+
+client = TestClient(app)
+
+def wait_for_job(job_id, timeout=60):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        data = client.get(f"/jobs/{job_id}").json()
+        if data["status"] not in ("pending", "running"):
+            return data
+        time.sleep(0.2)
+    raise AssertionError("Job did not finish in time")
+
+def test_nutrition_batch_job():
+    response = client.post(
+        "/jobs/",
+        json={
+            "kind": "nutrition_batch",
+            "params": {
+                "inputs": [
+                    {"age": 30, "weight": 80, "height": 180, "sex": "M", "activity_level": "moderately_active"},
+                    {"age": 30, "weight": 60, "height": 165, "sex": "F", "activity_level": "sedentary"}
+                ]
+            }
+        }
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["status"] in ("pending", "running")
+
+    data = wait_for_job(data["id"])
+    assert data["status"] == "succeeded"
+    assert data["progress"] == 1.0
+    assert int(data["result"][0]["tmb"]) == 1780
+    assert len(data["result"]) == 2
+
+def test_failed_job_reports_error():
+    response = client.post(
+        "/jobs/",
+        json={"kind": "nutrition_batch", "params": {"inputs": [{"age": -1}]}}
+    )
+    data = wait_for_job(response.json()["id"])
+    assert data["status"] == "failed"
+    assert "ValidationError" in data["error"]
+
+def test_unknown_job_kind():
+    response = client.post("/jobs/", json={"kind": "rm_rf"})
+    assert response.status_code == 422
+
+def test_read_missing_job():
+    response = client.get("/jobs/999999")
+    assert response.status_code == 404
+
+def test_orphaned_jobs_recovered():
+    from backend.app import jobs, models
+    from backend.app.database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        # A pid that can't exist, and a row from before jobs had owners
+        dead = models.Job(kind="nutrition_batch", status="running", progress=0.0, owner=f"{socket.gethostname()}:99999999")
+        legacy = models.Job(kind="nutrition_batch", status="pending", progress=0.0)
+        db.add_all([dead, legacy])
+        db.commit()
+        ids = [dead.id, legacy.id]
+    finally:
+        db.close()
+
+    jobs.recover()
+
+    for job_id in ids:
+        data = client.get(f"/jobs/{job_id}").json()
+        assert data["status"] == "failed"
+        assert data["finished_at"] is not None
+
+def test_catalog_job_clears_cache():
+    from concurrent.futures import Future
+    from backend.app import cache, jobs, schemas
+
+    future = Future()
+    future.set_result(None)
+
+    cache.backend.set("test:jobs", 1)
+    jobs._done(0, schemas.JobKindEnum.NUTRITION_BATCH, future)
+    assert cache.backend.get("test:jobs") == 1
+
+    jobs._done(0, schemas.JobKindEnum.IMPORT_TACO, future)
+    assert cache.backend.get("test:jobs") is cache._MISSING
+
+def test_cancelled_import_leaves_catalog():
+    from backend import import_taco
+    from backend.app import catalog, jobs, models
+    from backend.app.database import SessionLocal
+
+    def progress(done, total):
+        if done >= 200:
+            raise jobs.JobCancelled()
+
+    db = SessionLocal()
+    try:
+        foods, version = db.query(models.Food).count(), catalog.current_version(db)
+        with pytest.raises(jobs.JobCancelled):
+            import_taco.import_data(import_taco.DEFAULT_FILE_PATH, progress=progress)
+        assert db.query(models.Food).count() == foods
+        assert catalog.current_version(db) == version
+    finally:
+        db.close()
@@ -1,3 +1,4 @@
+import json
 from fastapi.testclient import TestClient
 from backend.app.main import app
 
@@ -41,3 +42,26 @@ def test_delete_meal():
     
     response = client.get(f"/meals/{meal_id}")
     assert response.status_code == 404
+
+def test_export_meals_ndjson():
+    meal_id = test_create_meal()
+    client.post(f"/meals/{meal_id}/items", json={"food_id": 1, "quantity": 50})
+
+    response = client.get("/meals/export", params={"meal_id": meal_id})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert len(rows) == 1
+    assert rows[0]["meal_id"] == meal_id
+    assert rows[0]["quantity"] == 50
+    assert "energy_kcal" in rows[0]
+
+def test_item_nutrients_snapshotted(create_food):
+    food_id = create_food("Snapshot Food", 200, 10, 20, 5)
+    meal = client.post("/meals/", json={"name": "Snapshot Meal", "items": [{"food_id": food_id, "quantity": 50}]}).json()
+    assert meal["items"][0]["energy_kcal"] == 100
+
+    client.put(f"/foods/{food_id}", json={"energy_kcal": 400})
+    item = client.get(f"/meals/{meal['id']}").json()["items"][0]
+    assert item["energy_kcal"] == 100
+    assert item["protein"] == 5
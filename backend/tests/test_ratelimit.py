@@ -0,0 +1,55 @@
+import threading
+import time
+from fastapi.testclient import TestClient
+from backend.app.main import app
+from backend.app import cache
+from backend.app.ratelimit import TokenBucketLimiter, search_limiter
+
+client = TestClient(app)
+
+def test_token_bucket_refills():
+    now = [0.0]
+    limiter = TokenBucketLimiter(rate=2, burst=2, clock=lambda: now[0])
+
+    assert limiter.acquire("a") == 0
+    assert limiter.acquire("a") == 0
+    assert limiter.acquire("a") > 0
+    # Other clients have their own bucket
+    assert limiter.acquire("b") == 0
+
+    now[0] += 0.5
+    assert limiter.acquire("a") == 0
+
+def test_search_rate_limited(monkeypatch):
+    monkeypatch.setattr(search_limiter, "burst", 2)
+    monkeypatch.setattr(search_limiter, "rate", 0.001)
+    try:
+        statuses = [client.get("/foods/", params={"search": "arroz"}).status_code for _ in range(3)]
+        assert statuses == [200, 200, 429]
+        # Plain listing is not limited
+        assert client.get("/foods/").status_code == 200
+    finally:
+        search_limiter._buckets.clear()
+
+def test_single_flight_coalesces_concurrent_calls():
+    calls = []
+
+    @cache.single_flight("test:slow", key=lambda value: (value,))
+    def slow(value):
+        calls.append(value)
+        time.sleep(0.2)
+        return {"value": value}
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(slow(1))) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert calls == [1]
+    assert results == [{"value": 1}] * 5
+
+    # Nothing is kept once the call finished
+    slow(1)
+    assert calls == [1, 1]
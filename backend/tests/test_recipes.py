@@ -0,0 +1,83 @@
+from fastapi.testclient import TestClient
+from backend.app.main import app
+
+client = TestClient(app)
+
+def test_recipe_profile_per_100g(create_food):
+    rice = create_food("Recipe Test Rice", 360, 7)
+    beans = create_food("Recipe Test Beans", 330, 20)
+
+    response = client.post(
+        "/recipes/",
+        json={
+            "name": "Arroz com feijão",
+            "yield_factor": 2.0,
+            "ingredients": [
+                {"food_id": rice, "quantity": 100},
+                {"food_id": beans, "quantity": 100}
+            ]
+        }
+    )
+    assert response.status_code == 200
+    data = response.json()
+    # 690 kcal over 400 g cooked
+    assert abs(data["food"]["energy_kcal"] - 172.5) < 0.01
+    assert abs(data["food"]["protein"] - 6.75) < 0.01
+    assert data["food"]["base_qty"] == 100
+
+def test_recipe_follows_ingredient_update(create_food):
+    rice = create_food("Recipe Test Rice 2", 360, 7)
+    recipe = client.post(
+        "/recipes/",
+        json={"name": "Arroz", "ingredients": [{"food_id": rice, "quantity": 200}]}
+    ).json()
+
+    client.put(f"/foods/{rice}", json={"energy_kcal": 100})
+
+    data = client.get(f"/recipes/{recipe['id']}").json()
+    assert abs(data["food"]["energy_kcal"] - 100) < 0.01
+
+def test_recipe_as_meal_item(create_food):
+    rice = create_food("Recipe Test Rice 3", 360, 7)
+    recipe = client.post(
+        "/recipes/",
+        json={"name": "Arroz", "ingredients": [{"food_id": rice, "quantity": 100}]}
+    ).json()
+    meal = client.post("/meals/", json={"name": "Recipe Lunch"}).json()
+
+    response = client.post(
+        f"/meals/{meal['id']}/items",
+        json={"food_id": recipe["food_id"], "quantity": 50}
+    )
+    assert response.status_code == 200
+    assert response.json()["items"][0]["food"]["energy_kcal"] == 360
+
+def test_recipe_missing_ingredient():
+    response = client.post(
+        "/recipes/",
+        json={"name": "Missing", "ingredients": [{"food_id": 999999, "quantity": 100}]}
+    )
+    assert response.status_code == 404
+
+def test_recipe_cycle_rejected(create_food):
+    food_id = create_food("Cycle Base", 100, 1)
+    a = client.post("/recipes/", json={"name": "Cycle A", "ingredients": [{"food_id": food_id, "quantity": 100}]}).json()
+    b = client.post("/recipes/", json={"name": "Cycle B", "ingredients": [{"food_id": a["food_id"], "quantity": 100}]}).json()
+
+    response = client.put(
+        f"/recipes/{a['id']}",
+        json={"name": "Cycle A", "ingredients": [{"food_id": b["food_id"], "quantity": 100}]}
+    )
+    assert response.status_code == 400
+
+def test_recipe_food_cannot_be_edited_or_deleted(create_food):
+    food_id = create_food("Owned Base", 100, 1)
+    recipe = client.post("/recipes/", json={"name": "Owned", "ingredients": [{"food_id": food_id, "quantity": 100}]}).json()
+
+    assert client.put(f"/foods/{recipe['food_id']}", json={"energy_kcal": 9999, "base_qty": 1}).status_code == 409
+    assert client.delete(f"/foods/{recipe['food_id']}").status_code == 409
+    response = client.put(
+        f"/recipes/{recipe['id']}",
+        json={"name": "Owned", "ingredients": [{"food_id": food_id, "quantity": 50}]}
+    )
+    assert response.status_code == 200
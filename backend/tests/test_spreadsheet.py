@@ -0,0 +1,69 @@
+import os
+import zipfile
+from backend import spreadsheet
+from backend.import_taco import DEFAULT_FILE_PATH
+
+CONTENT = """<?xml version="1.0" encoding="UTF-8"?>
+<office:document-content
+    xmlns:office="urn:oasis:names:tc:opendocument:xmlns:office:1.0"
+    xmlns:table="urn:oasis:names:tc:opendocument:xmlns:table:1.0"
+    xmlns:text="urn:oasis:names:tc:opendocument:xmlns:text:1.0">
+<office:body><office:spreadsheet>
+<table:table table:name="First">
+  <table:table-row>
+    <table:table-cell office:value-type="string"><text:p>Name</text:p></table:table-cell>
+    <table:table-cell office:value-type="float" office:value="1.5"/>
+    <table:table-cell table:number-columns-repeated="1024"/>
+  </table:table-row>
+  <table:table-row table:number-rows-repeated="2">
+    <table:table-cell table:number-columns-repeated="1024"/>
+  </table:table-row>
+  <table:table-row table:number-rows-repeated="2">
+    <table:table-cell/>
+    <table:table-cell office:value-type="string"><text:p>tr</text:p></table:table-cell>
+  </table:table-row>
+  <table:table-row table:number-rows-repeated="1048570">
+    <table:table-cell table:number-columns-repeated="1024"/>
+  </table:table-row>
+</table:table>
+<table:table table:name="Second">
+  <table:table-row>
+    <table:table-cell office:value-type="float" office:value="2"/>
+  </table:table-row>
+  <table:table-row>
+    <table:table-cell office:value-type="float" office:value="3"/>
+    <table:table-cell table:number-columns-repeated="1500"/>
+    <table:table-cell office:value-type="float" office:value="4"/>
+    <table:table-cell table:number-columns-repeated="16000"/>
+  </table:table-row>
+</table:table>
+</office:spreadsheet></office:body>
+</office:document-content>
+"""
+
+def write_ods(tmp_path):
+    path = os.path.join(tmp_path, "sheet.ods")
+    with zipfile.ZipFile(path, "w") as archive:
+        archive.writestr("mimetype", "application/vnd.oasis.opendocument.spreadsheet")
+        archive.writestr("content.xml", CONTENT)
+    return path
+
+def test_ods_rows_expand_repeats_and_drop_trailing_blanks(tmp_path):
+    path = write_ods(tmp_path)
+    assert spreadsheet.sheet_names(path) == ["First", "Second"]
+    assert list(spreadsheet.iter_rows(path)) == [
+        ("Name", 1.5),
+        (),
+        (),
+        (None, "tr"),
+        (None, "tr"),
+    ]
+    # Blank runs inside a row keep their width
+    assert list(spreadsheet.iter_rows(path, "Second")) == [(2.0,), (3.0,) + (None,) * 1500 + (4.0,)]
+
+def test_reads_taco_spreadsheet():
+    rows = list(spreadsheet.iter_rows(DEFAULT_FILE_PATH))
+    assert rows[3] == ("Cereais e derivados",)
+    assert rows[4][:2] == (1.0, "Arroz, integral, cozido")
+    # Three header rows, then 600+ foods under their category rows
+    assert len(rows) > 600
@@ -130,12 +130,7 @@ export default function Calculator() {
         weight: currentData.weight,
         height: currentData.height,
         sex: currentData.sex,
-        activity_level: currentData.activity_level,
-        goal_tmb: result.tmb,
-        goal_get: result.get,
-        goal_protein_g: result.macros.protein.max_grams, // Saving the max of range as target
-        goal_carbs_g: result.macros.carbohydrate.max_grams,
-        goal_fat_g: result.macros.lipid.max_grams
+        activity_level: currentData.activity_level
       });
       navigate('/dashboard');
     } catch (err) {
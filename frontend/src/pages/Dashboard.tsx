@@ -44,13 +44,11 @@ export default function Dashboard() {
     let kcal = 0, protein = 0, carbs = 0, fat = 0;
     meals.forEach(meal => {
       meal.items.forEach(item => {
-        if (item.food) {
-          const ratio = item.quantity / 100;
-          kcal += (item.food.energy_kcal || 0) * ratio;
-          protein += (item.food.protein || 0) * ratio;
-          carbs += (item.food.carbohydrate || 0) * ratio;
-          fat += (item.food.lipid || 0) * ratio;
-        }
+        // Snapshotted values: past meals don't change when a food is edited
+        kcal += item.energy_kcal || 0;
+        protein += item.protein || 0;
+        carbs += item.carbohydrate || 0;
+        fat += item.lipid || 0;
       });
     });
     return { kcal, protein, carbs, fat };
@@ -176,11 +174,10 @@ export default function Dashboard() {
       meals.forEach(meal => {
         meal.items.forEach(item => {
           const food = item.food;
-          const ratio = item.quantity / 100;
-          const kcal = ((food?.energy_kcal || 0) * ratio).toFixed(0);
-          const p = ((food?.protein || 0) * ratio).toFixed(1);
-          const c = ((food?.carbohydrate || 0) * ratio).toFixed(1);
-          const f = ((food?.lipid || 0) * ratio).toFixed(1);
+          const kcal = (item.energy_kcal || 0).toFixed(0);
+          const p = (item.protein || 0).toFixed(1);
+          const c = (item.carbohydrate || 0).toFixed(1);
+          const f = (item.lipid || 0).toFixed(1);
           const row = [
             'Refeicoes',
             meal.name,
@@ -473,11 +470,10 @@ export default function Dashboard() {
                       <tbody>
                         {meal.items.map((item) => {
                           const food = item.food;
-                          const ratio = item.quantity / 100;
-                          const kcal = ((food?.energy_kcal || 0) * ratio).toFixed(0);
-                          const p = ((food?.protein || 0) * ratio).toFixed(1);
-                          const c = ((food?.carbohydrate || 0) * ratio).toFixed(1);
-                          const f = ((food?.lipid || 0) * ratio).toFixed(1);
+                          const kcal = (item.energy_kcal || 0).toFixed(0);
+                          const p = (item.protein || 0).toFixed(1);
+                          const c = (item.carbohydrate || 0).toFixed(1);
+                          const f = (item.lipid || 0).toFixed(1);
                           return (
                             <tr key={`${meal.name}-${item.food_id}-${item.quantity}`} className="border-t">
                               <td className="py-1 pr-2 text-gray-900">{food?.name || `#${item.food_id}`}</td>
@@ -42,13 +42,11 @@ export default function MealPlanner() {
     let kcal = 0, protein = 0, carbs = 0, fat = 0;
     meals.forEach(meal => {
       meal.items.forEach(item => {
-        if (item.food) {
-           const ratio = item.quantity / 100;
-           kcal += (item.food.energy_kcal || 0) * ratio;
-           protein += (item.food.protein || 0) * ratio;
-           carbs += (item.food.carbohydrate || 0) * ratio;
-           fat += (item.food.lipid || 0) * ratio;
-        }
+        // Snapshotted values: past meals don't change when a food is edited
+        kcal += item.energy_kcal || 0;
+        protein += item.protein || 0;
+        carbs += item.carbohydrate || 0;
+        fat += item.lipid || 0;
       });
     });
     setDailyTotals({ kcal, protein, carbs, fat });
@@ -196,10 +194,7 @@ function MealCard({ meal, onDelete, onAddFood, onRemoveItem }: {
     // Calculate meal totals
     let kcal = 0;
     meal.items.forEach(item => {
-        if (item.food) {
-           const ratio = item.quantity / 100;
-           kcal += (item.food.energy_kcal || 0) * ratio;
-        }
+        kcal += item.energy_kcal || 0;
     });
 
     return (
@@ -232,16 +227,15 @@ function MealCard({ meal, onDelete, onAddFood, onRemoveItem }: {
                             <tbody className="bg-white divide-y divide-gray-200">
                                 {meal.items.map(item => {
                                     if (!item.food) return null;
-                                    const ratio = item.quantity / 100;
                                     return (
                                         <tr key={item.id}>
                                             <td className="px-3 py-2 whitespace-nowrap text-sm text-gray-900">{item.food.name}</td>
                                             <td className="px-3 py-2 whitespace-nowrap text-sm text-gray-500 text-right">{item.quantity}g</td>
-                                            <td className="px-3 py-2 whitespace-nowrap text-sm text-gray-900 text-right">{((item.food.energy_kcal || 0) * ratio).toFixed(0)}</td>
+                                            <td className="px-3 py-2 whitespace-nowrap text-sm text-gray-900 text-right">{(item.energy_kcal || 0).toFixed(0)}</td>
                                             <td className="px-3 py-2 whitespace-nowrap text-sm text-gray-500 text-right">
-                                                <span className="text-blue-600">{((item.food.protein || 0) * ratio).toFixed(1)}</span> / 
-                                                <span className="text-green-600">{((item.food.carbohydrate || 0) * ratio).toFixed(1)}</span> / 
-                                                <span className="text-yellow-600">{((item.food.lipid || 0) * ratio).toFixed(1)}</span>
+                                                <span className="text-blue-600">{(item.protein || 0).toFixed(1)}</span> / 
+                                                <span className="text-green-600">{(item.carbohydrate || 0).toFixed(1)}</span> / 
+                                                <span className="text-yellow-600">{(item.lipid || 0).toFixed(1)}</span>
                                             </td>
                                             <td className="px-3 py-2 whitespace-nowrap text-right text-sm font-medium">
                                                 <button onClick={() => onRemoveItem(item.id)} className="text-red-400 hover:text-red-600">
@@ -1,5 +1,5 @@
 import axios from 'axios';
-import { NutritionCalculationRequest, NutritionCalculationResponse, Meal, MealCreate, MealItemCreate, UserProfile, UserProfileCreate, HouseholdMeasure, Food } from '../types';
+import { NutritionCalculationRequest, NutritionCalculationResponse, Meal, MealCreate, MealItemCreate, UserProfile, UserProfileCreate, HouseholdMeasure, Food, CatalogSnapshot, CatalogChanges, IntakeBucket, IntakeBucketSize, AdherenceReport } from '../types';
 
 const api = axios.create({
   baseURL: 'http://localhost:8000',
@@ -44,6 +44,11 @@ export const saveProfile = async (data: UserProfileCreate): Promise<UserProfile>
   return response.data;
 };
 
+export const getAdherence = async (day?: string): Promise<AdherenceReport> => {
+  const response = await api.get<AdherenceReport>('/profile/adherence', { params: { day } });
+  return response.data;
+};
+
 export const getHouseholdMeasures = async (foodId: number): Promise<HouseholdMeasure[]> => {
   const response = await api.get<HouseholdMeasure[]>(`/measures/${foodId}`);
   return response.data;
@@ -64,4 +69,20 @@ export const deleteFood = async (id: number): Promise<void> => {
   await api.delete(`/foods/${id}`);
 };
 
+export const getIntakeSummary = async (from: string, to: string, bucket: IntakeBucketSize = 'day'): Promise<IntakeBucket[]> => {
+  const response = await api.get<IntakeBucket[]>('/intake/summary', { params: { from, to, bucket } });
+  return response.data;
+};
+
+// Catalog sync (offline copy of foods, categories and measures)
+export const getCatalogSnapshot = async (): Promise<CatalogSnapshot> => {
+  const response = await api.get<CatalogSnapshot>('/catalog/snapshot');
+  return response.data;
+};
+
+export const getCatalogChanges = async (since: number): Promise<CatalogChanges> => {
+  const response = await api.get<CatalogChanges>('/catalog/changes', { params: { since } });
+  return response.data;
+};
+
 export default api;
@@ -68,7 +68,13 @@ export interface MealItem {
     meal_id: number;
     food_id: number;
     quantity: number;
+    consumed_at?: string;
     food?: Food;
+    // Nutrients for `quantity`, snapshotted when the item was added
+    energy_kcal?: number | null;
+    protein?: number | null;
+    carbohydrate?: number | null;
+    lipid?: number | null;
 }
 
 export interface MealItemCreate {
@@ -79,6 +85,7 @@ export interface MealItemCreate {
 export interface Meal {
     id: number;
     name: string;
+    consumed_at?: string;
     items: MealItem[];
 }
 
@@ -96,14 +103,16 @@ export interface UserProfile {
     sex: Sex;
     activity_level: ActivityLevel;
     
+    // Computed by the server from the fields above
     goal_tmb: number;
     goal_get: number;
     goal_protein_g: number;
     goal_carbs_g: number;
     goal_fat_g: number;
+    goals_version: number;
 }
 
-export type UserProfileCreate = Omit<UserProfile, 'id'>;
+export type UserProfileCreate = Pick<UserProfile, 'name' | 'age' | 'weight' | 'height' | 'sex' | 'activity_level'>;
 
 export interface HouseholdMeasure {
     id: number;
@@ -117,3 +126,56 @@ export interface HouseholdMeasureCreate {
     unit_name: string;
     quantity_g: number;
 }
+
+// Catalog Sync Types
+
+export interface CatalogSnapshot {
+    version: number;
+    foods: Food[];
+    categories: CategorySimple[];
+    measures: HouseholdMeasure[];
+}
+
+export interface CatalogChanges extends CatalogSnapshot {
+    reset: boolean;
+    deleted: {
+        foods?: number[];
+        categories?: number[];
+        measures?: number[];
+    };
+}
+
+// Intake History Types
+
+export type IntakeBucketSize = 'day' | 'week' | 'month';
+
+export interface IntakeBucket {
+    period: string;
+    quantity: number;
+    nutrients: Record<string, number | null>;
+}
+
+// Adherence Types
+
+export interface MacroAdherence {
+    nutrient: string;
+    intake: number;
+    goal: number | null;
+    deviation: number | null;
+}
+
+export interface MicronutrientStatus {
+    nutrient: string;
+    intake: number;
+    reference: number;
+    unit: string;
+    pct: number;
+}
+
+export interface AdherenceReport {
+    day: string;
+    score: number | null;
+    macros: MacroAdherence[];
+    deficits: MicronutrientStatus[];
+    excesses: MicronutrientStatus[];
+}
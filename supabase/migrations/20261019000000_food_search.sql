@@ -0,0 +1,35 @@
+-- Indexed food search (used by GET /foods/?search=)
+
+CREATE EXTENSION IF NOT EXISTS unaccent;
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+-- unaccent() is only STABLE; indexes and generated columns need IMMUTABLE
+CREATE OR REPLACE FUNCTION immutable_unaccent(text)
+RETURNS text
+LANGUAGE sql IMMUTABLE PARALLEL SAFE STRICT
+AS $$ SELECT public.unaccent('public.unaccent'::regdictionary, $1) $$;
+
+-- Portuguese stemming, accent-insensitive ("feijao" matches "Feijão")
+DO $$
+BEGIN
+    IF NOT EXISTS (SELECT 1 FROM pg_ts_config WHERE cfgname = 'portuguese_unaccent') THEN
+        CREATE TEXT SEARCH CONFIGURATION portuguese_unaccent (COPY = portuguese);
+        ALTER TEXT SEARCH CONFIGURATION portuguese_unaccent
+            ALTER MAPPING FOR hword, hword_part, word WITH unaccent, portuguese_stem;
+    END IF;
+END
+$$;
+
+ALTER TABLE foods ADD COLUMN IF NOT EXISTS description TEXT;
+
+ALTER TABLE foods ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('portuguese_unaccent', coalesce(name, '')), 'A') ||
+        setweight(to_tsvector('portuguese_unaccent', coalesce(description, '')), 'B')
+    ) STORED;
+
+-- Full-text matches
+CREATE INDEX IF NOT EXISTS idx_foods_search_vector ON foods USING GIN (search_vector);
+
+-- Typo-tolerant / substring matches on the name
+CREATE INDEX IF NOT EXISTS idx_foods_name_trgm ON foods USING GIN (immutable_unaccent(lower(name)) gin_trgm_ops);